@@ -2,6 +2,7 @@ from sqladmin import Admin, ModelView
 from app.databaseConfigs.models.authServiceModel.user import User
 from app.databaseConfigs.database import engine
 from app.adminService.auth import AdminAuth
+from app.authService.services.principal_cache import invalidate_principal, principal_keys
 
 
 class UserAdmin(ModelView, model=User):
@@ -11,6 +12,16 @@ class UserAdmin(ModelView, model=User):
     name_plural = "Users"
     icon = "fa-solid fa-user"
 
+    async def on_model_change(self, data, model, is_created, request):
+        # Identifiers before the edit; dropped together with the new ones once committed
+        request.state.principal_keys = [] if is_created else principal_keys(model)
+
+    async def after_model_change(self, data, model, is_created, request):
+        await invalidate_principal(*request.state.principal_keys, *principal_keys(model))
+
+    async def after_model_delete(self, model, request):
+        await invalidate_principal(*principal_keys(model))
+
 admin_auth = AdminAuth(secret_key="supersecretkey")  # can reuse JWT secret
 
 def setup_admin(app):
@@ -1,13 +1,14 @@
-from fastapi import Depends, HTTPException, status, Request, Response, BackgroundTasks, Query
+from fastapi import Depends, HTTPException, status, Request, Response, Query
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError
 from datetime import timedelta
 
-from app.databaseConfigs.database import get_db
+from app.databaseConfigs.database import get_db, get_read_db
 from app.config import settings
 from app.authService.schemas.user import UserCreate, OTPVerifyRequest
 from app.authService.services import auth as auth_service
+from app.authService.services.principal_cache import dump_principal, load_principal, principal_cache
 from app.authService.auth import jwt as jwt_utils
 from app.databaseConfigs.models.authServiceModel.user import User
 from app.utils.validators import validate_and_format_phone_number
@@ -19,9 +20,8 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 async def register_user_dependency(
     user: UserCreate,
     db: AsyncSession = Depends(get_db),
-    background_tasks: BackgroundTasks = None  # passed from route
 ):
-    return await auth_service.create_user(user, db, background_tasks)
+    return await auth_service.create_user(user, db)
 
 
 # ---------------- LOGIN (SEND OTP) ----------------
@@ -36,8 +36,7 @@ async def login_user_dependency(
         except Exception as e:
             print(f"Phone format error: {e}")
 
-    user = await auth_service.get_user_by_email(db, formatted_identifier) \
-        or await auth_service.get_user_by_phone(db, formatted_identifier)
+    user = await auth_service.get_user_by_identifier(db, formatted_identifier)
 
     if not user:
         raise HTTPException(
@@ -68,8 +67,7 @@ async def verify_otp_dependency(
     response: Response,
     db: AsyncSession = Depends(get_db),
 ):
-    user = await auth_service.get_user_by_email(db, payload.identifier) \
-        or await auth_service.get_user_by_phone(db, payload.identifier)
+    user = await auth_service.get_user_by_identifier(db, payload.identifier)
     if not user:
         raise HTTPException(status_code=400, detail="User not found")
 
@@ -101,7 +99,8 @@ async def verify_otp_dependency(
 # ---------------- CURRENT USER ----------------
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db),
+    primary_db: AsyncSession = Depends(get_db),
 ) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -114,17 +113,21 @@ async def get_current_user(
         if not sub:
             raise credentials_exception
         jti = payload.get("jti")
-        if await jwt_utils.is_token_blacklisted(jti, db):
+        # Revocation is checked on the primary: a lagging replica may not have the
+        # blacklist row yet. Only the principal itself is loaded from a replica.
+        if await jwt_utils.is_token_blacklisted(jti, primary_db):
             raise credentials_exception
     except JWTError:
         raise credentials_exception
 
-    user = await auth_service.get_user_by_email(db, sub) \
-        or await auth_service.get_user_by_phone(db, sub)
-    if not user:
-        raise credentials_exception
+    async def load_user() -> bytes:
+        user = await auth_service.get_user_by_identifier(db, sub)
+        if not user:
+            raise credentials_exception
+        return dump_principal(user)
 
-    return user
+    # Usually no query at all: the blacklist check above is answered in memory too
+    return load_principal(await principal_cache.get_or_load(sub, load_user))
 
 
 # ---------------- ADMIN CHECK ----------------
@@ -3,6 +3,7 @@ from jose import jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.databaseConfigs.models.authServiceModel.blacklist import BlacklistedToken
+from app.authService.auth.revocation import revocation_filter
 from app.config import settings
 import secrets
 
@@ -34,6 +35,10 @@ def decode_refresh_token(token: str):
 
 
 async def is_token_blacklisted(jti: str, db: AsyncSession) -> bool:
+    # Answered in memory unless the revocation filter has a (possible) hit
+    revoked = revocation_filter.check(jti)
+    if revoked is not None:
+        return revoked
     result = await db.execute(select(BlacklistedToken).where(BlacklistedToken.jti == jti))
     token_entry = result.scalar_one_or_none()
     return token_entry is not None and token_entry.expires_at > datetime.utcnow()
@@ -42,3 +47,4 @@ async def is_token_blacklisted(jti: str, db: AsyncSession) -> bool:
 async def blacklist_token(jti: str, db: AsyncSession, expires_at: datetime):
     db.add(BlacklistedToken(jti=jti, expires_at=expires_at))
     await db.commit()
+    revocation_filter.add(jti, expires_at)
@@ -0,0 +1,164 @@
+import asyncio
+import hashlib
+import math
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import func
+from sqlalchemy.future import select
+
+from app.config import settings
+from app.databaseConfigs.database import SessionLocal
+from app.databaseConfigs.models.authServiceModel.blacklist import BlacklistedToken
+
+# blacklisted_at comes from each writer's clock and rows commit out of order, so every
+# sync re-reads this far behind its high-water mark (re-adding a JTI is harmless)
+SYNC_OVERLAP = timedelta(seconds=60)
+MIN_BLOOM_CAPACITY = 1024
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings: no false negatives, false positives at about
+    `error_rate` once `capacity` keys are in. Positions come from one BLAKE2b digest
+    split into two 64-bit halves (double hashing).
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class RevocationFilter:
+    """
+    Per-worker view of blacklisted_tokens, so checking a token that was never revoked
+    (nearly all of them) costs no query.
+
+    - The Bloom filter holds every unexpired JTI as of the last (re)load, compactly.
+    - The exact map holds JTIs revoked since then, by this worker or seen by `sync`,
+      with their expiry; expired ones are pruned on each sync.
+
+    `check` answers False for a Bloom miss, True/False for an exact entry, and None
+    (ask the database) for a Bloom hit, i.e. a token revoked before the load or a
+    false positive. Revocations made by another worker are picked up by the next
+    sync, TOKEN_REVOCATION_SYNC_SECONDS at most.
+    """
+
+    def __init__(self, error_rate: float, exact_max: int):
+        self.error_rate = error_rate
+        self.exact_max = exact_max
+        self._bloom = BloomFilter(MIN_BLOOM_CAPACITY, error_rate)
+        self._exact: Dict[str, datetime] = {}
+        self._synced_through: Optional[datetime] = None
+        self.loaded_at: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        self._exact[jti] = expires_at
+
+    def check(self, jti: Optional[str]) -> Optional[bool]:
+        if not jti:
+            return False
+        if not self.loaded:
+            return None
+        expires_at = self._exact.get(jti)
+        if expires_at is not None:
+            return expires_at > datetime.utcnow()
+        if jti in self._bloom:
+            return None
+        return False
+
+    async def load(self) -> None:
+        """
+        Rebuild the Bloom filter from every unexpired row and start a fresh exact map.
+        """
+        now = datetime.utcnow()
+        folded = set(self._exact)
+        async with SessionLocal() as db:
+            result = await db.execute(select(BlacklistedToken.jti).where(BlacklistedToken.expires_at > now))
+            jtis = result.scalars().all()
+            synced_through = (await db.execute(select(func.max(BlacklistedToken.blacklisted_at)))).scalar()
+
+        bloom = BloomFilter(max(MIN_BLOOM_CAPACITY, 2 * len(jtis)), self.error_rate)
+        for jti in jtis:
+            bloom.add(jti)
+        # Keep exact entries added while the rows were being read; they may not be in them
+        self._bloom = bloom
+        self._exact = {jti: expires_at for jti, expires_at in self._exact.items() if jti not in folded}
+        self._synced_through = synced_through or now
+        self.loaded_at = time.monotonic()
+
+    async def sync(self) -> None:
+        """
+        Pull revocations made by other workers since the last sync and prune expired
+        exact entries; reload entirely once the exact map outgrows `exact_max` or the
+        filter is older than TOKEN_REVOCATION_REBUILD_SECONDS (dropping expired JTIs).
+        """
+        if (
+            not self.loaded
+            or len(self._exact) > self.exact_max
+            or time.monotonic() - self.loaded_at > settings.TOKEN_REVOCATION_REBUILD_SECONDS
+        ):
+            await self.load()
+            return
+
+        since = self._synced_through - SYNC_OVERLAP
+        async with SessionLocal() as db:
+            result = await db.execute(
+                select(BlacklistedToken.jti, BlacklistedToken.expires_at, BlacklistedToken.blacklisted_at)
+                .where(BlacklistedToken.blacklisted_at >= since)
+            )
+            rows = result.all()
+
+        for jti, expires_at, blacklisted_at in rows:
+            self._exact[jti] = expires_at
+            if blacklisted_at and blacklisted_at > self._synced_through:
+                self._synced_through = blacklisted_at
+
+        now = datetime.utcnow()
+        self._exact = {jti: expires_at for jti, expires_at in self._exact.items() if expires_at > now}
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "bloom_bits": self._bloom.size,
+            "bloom_hashes": self._bloom.hash_count,
+            "exact_entries": len(self._exact),
+        }
+
+
+revocation_filter = RevocationFilter(
+    error_rate=settings.TOKEN_REVOCATION_FALSE_POSITIVE_RATE,
+    exact_max=settings.TOKEN_REVOCATION_EXACT_MAX,
+)
+
+
+async def run_revocation_sync() -> None:
+    """
+    Background loop started from the app lifespan.
+    """
+    while True:
+        await asyncio.sleep(settings.TOKEN_REVOCATION_SYNC_SECONDS)
+        try:
+            await revocation_filter.sync()
+        except Exception as e:
+            print(f"Token revocation sync failed: {e}")
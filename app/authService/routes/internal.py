@@ -2,10 +2,14 @@ from fastapi import APIRouter, Header, HTTPException, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
-from app.databaseConfigs.database import get_db
+from app.databaseConfigs.database import get_db, pool_stats
 from app.authService.services.auth import verify_password
 from app.authService.services import auth as auth_service
 from app.config import settings
+from app.productService.services.product_cache import compressed_product_cache, product_cache
+from app.authService.auth.revocation import revocation_filter
+from app.authService.services.principal_cache import principal_cache
+from app.authService.services.blacklist import reaper_stats
 
 class UserVerifyRequest(BaseModel):
     email: str
@@ -27,15 +31,48 @@ async def verify_user_is_admin_internal(
     if not user:
         return {"success": False}
 
-    if data.password != "__session__":
-        if not await verify_password(data.password, user.password):
-            return {"success": False}
-
     if user.role != "admin":
         return {"success": False}
 
+    if data.password != "__session__":
+        # Admins sign in with a login OTP (single use) or a stored bcrypt password
+        if not (
+            await auth_service.verify_otp(user, data.password, db)
+            or await verify_password(data.password, user.password)
+        ):
+            return {"success": False}
+
     return {
         "success": True,
         "email": user.email,
         "role": user.role
     }
+
+
+@router.get("/cache-stats")
+async def cache_stats(x_internal_token: str = Header(...)):
+    if x_internal_token != settings.INTERNAL_SECRET_TOKEN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Unauthorized")
+
+    return {
+        "product": product_cache.stats(),
+        "product_compressed": compressed_product_cache.stats(),
+        "principal": principal_cache.stats(),
+        "token_revocation": revocation_filter.stats(),
+    }
+
+
+@router.get("/db-pool")
+async def db_pool_stats(x_internal_token: str = Header(...)):
+    if x_internal_token != settings.INTERNAL_SECRET_TOKEN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Unauthorized")
+
+    return pool_stats()
+
+
+@router.get("/blacklist-reaper")
+async def blacklist_reaper_stats(x_internal_token: str = Header(...)):
+    if x_internal_token != settings.INTERNAL_SECRET_TOKEN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Unauthorized")
+
+    return reaper_stats
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, Response, Header,BackgroundTasks
+from fastapi import APIRouter, Depends, Response, Header
 from app.authService.auth import dependencies as auth_dependency
 from app.authService.services import auth as auth_service
 from app.authService.schemas.user import UserCreate, UserOut, OTPVerifyRequest
@@ -15,10 +15,9 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 @router.post("/register")
 async def register_user(
     user: UserCreate,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
-    return await auth_service.create_user(user, db, background_tasks)
+    return await auth_service.create_user(user, db)
 
 
 @router.post("/login")
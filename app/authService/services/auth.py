@@ -1,19 +1,30 @@
 from datetime import datetime, timedelta
-from typing import Optional
-from fastapi import HTTPException, BackgroundTasks,status
+from typing import List, Optional, Tuple
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, or_
 from sqlalchemy.future import select
 from app.databaseConfigs.models.authServiceModel.user import User
+from app.databaseConfigs.models.authServiceModel.user_otp import UserOtp
 from app.authService.schemas.user import UserCreate
 from app.authService.auth import jwt as jwt_utils
 from app.config import settings
-import random
 import asyncio
+import contextlib
+import hashlib
+import heapq
+import hmac
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
 from app.databaseConfigs.database import SessionLocal
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Stored in users.password for accounts without a password: never verifies
+DISABLED_PASSWORD = "!"
+
 
 # ---------------- USER FETCH ----------------
 async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
@@ -26,25 +37,54 @@ async def get_user_by_phone(db: AsyncSession, phone: str) -> Optional[User]:
     return result.scalars().first()
 
 
+async def get_user_by_identifier(db: AsyncSession, identifier: str) -> Optional[User]:
+    """
+    Email or phone number in one query over both unique indexes; an email match wins.
+    """
+    result = await db.execute(
+        select(User)
+        .where(or_(User.email == identifier, User.phone_number == identifier))
+        .order_by((User.email == identifier).desc())
+        .limit(1)
+    )
+    return result.scalars().first()
+
+
 # ---------------- OTP ----------------
 def generate_otp() -> str:
-    return f"{random.randint(100000, 999999)}"
+    return f"{secrets.randbelow(900000) + 100000}"
 
 
-async def set_otp_for_user(user: User, db: AsyncSession):
+def _otp_key() -> bytes:
+    if settings.OTP_HMAC_KEY:
+        return settings.OTP_HMAC_KEY.encode()
+    return hashlib.sha256(b"otp:" + settings.JWT_SECRET_KEY.encode()).digest()
+
+
+def _otp_digest(user_id: int, otp: str) -> str:
+    # Keyed by user so a digest is worthless for any other account
+    return hmac.new(_otp_key(), f"{user_id}:{otp}".encode(), hashlib.sha256).hexdigest()
+
+
+async def _issue_otp(db: AsyncSession, user: User) -> Tuple[str, datetime]:
     """
-    Generate OTP, save hashed OTP to user.password, schedule auto-reset after expiry.
+    Replace the user's outstanding OTP in the caller's transaction.
     """
     otp = generate_otp()
-    hashed_otp = pwd_context.hash(otp)
-    user.password = hashed_otp
-    user.otp_expiry = datetime.utcnow() + timedelta(minutes=settings.OTP_EXPIRE_TIME)
+    expires_at = datetime.utcnow() + timedelta(minutes=settings.OTP_EXPIRE_TIME)
+    await db.merge(UserOtp(user_id=user.userid, digest=_otp_digest(user.userid, otp), expires_at=expires_at))
+    return otp, expires_at
+
+
+async def set_otp_for_user(user: User, db: AsyncSession):
+    """
+    Generate OTP, store its HMAC digest in user_otps, schedule its removal after expiry.
+    """
+    otp, expires_at = await _issue_otp(db, user)
     await db.commit()
-    await db.refresh(user)
     print(f"OTP for {user.email or user.phone_number}: {otp}")  # Replace with actual email/SMS sending
 
-    # Schedule OTP reset in background
-    # BackgroundTasks.add_task(reset_otp_after_expiry, user.id, db)
+    otp_expiry_scheduler.schedule(user.userid, expires_at)
 
     return otp
 
@@ -52,7 +92,6 @@ async def set_otp_for_user(user: User, db: AsyncSession):
 async def create_user(
     user_data: UserCreate,
     db: AsyncSession,
-    background_tasks: BackgroundTasks
 ) -> User:
     """
     Create a new user and send OTP. Raises 409 if email or phone exists.
@@ -73,28 +112,26 @@ async def create_user(
             detail="User already registered with this phone number"
         )
 
-    # ---------------- Generate OTP and create user ----------------
-    otp = generate_otp()
-    hashed_otp = pwd_context.hash(otp)
-
+    # ---------------- Create user and generate OTP ----------------
     db_user = User(
         phone_number=user_data.phone_number,
         email=user_data.email,
         name=user_data.name,
-        password=hashed_otp,
-        otp_expiry=datetime.utcnow() + timedelta(minutes=settings.OTP_EXPIRE_TIME),
+        password=DISABLED_PASSWORD,
         address=user_data.address.dict() if user_data.address else None,
         role=user_data.role.value if user_data.role else "user",
     )
 
     db.add(db_user)
+    await db.flush()
+    otp, expires_at = await _issue_otp(db, db_user)
     await db.commit()
     await db.refresh(db_user)
 
     print(f"OTP for {db_user.email or db_user.phone_number}: {otp}")
 
-    # ---------------- Schedule OTP reset in background ----------------
-    background_tasks.add_task(reset_otp_after_expiry, db_user.userid)
+    # ---------------- Schedule OTP removal after expiry ----------------
+    otp_expiry_scheduler.schedule(db_user.userid, expires_at)
 
     return db_user
 
@@ -102,21 +139,48 @@ async def verify_otp(user: User, otp: str, db: AsyncSession) -> bool:
     """
     Verify OTP and invalidate it immediately after use.
     """
-    if user.otp_expiry and user.otp_expiry < datetime.utcnow():
-        return False
-    if not pwd_context.verify(otp, user.password):
+    result = await db.execute(
+        select(UserOtp.digest).where(UserOtp.user_id == user.userid, UserOtp.expires_at > datetime.utcnow())
+    )
+    digest = result.scalar()
+    if digest is None or not hmac.compare_digest(digest, _otp_digest(user.userid, otp)):
         return False
-    # Invalidate OTP immediately
-    user.password = pwd_context.hash(generate_otp())
-    user.otp_expiry = None
+    # Invalidate OTP immediately; of two concurrent verifications only one deletes the row
+    result = await db.execute(delete(UserOtp).where(UserOtp.user_id == user.userid, UserOtp.digest == digest))
     await db.commit()
-    await db.refresh(user)
-    return True
+    return result.rowcount == 1
 
 
 # ---------------- PASSWORD ----------------
+_password_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _get_password_pool() -> ThreadPoolExecutor:
+    global _password_pool
+    if _password_pool is None:
+        _password_pool = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            thread_name_prefix="bcrypt",
+        )
+    return _password_pool
+
+
+def shutdown_password_pool() -> None:
+    global _password_pool
+    if _password_pool is not None:
+        _password_pool.shutdown(wait=False, cancel_futures=True)
+        _password_pool = None
+
+
 async def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    """
+    bcrypt check on the password thread pool, so the event loop never waits on it;
+    PASSWORD_HASH_WORKERS caps how many run at once.
+    """
+    if not pwd_context.identify(hashed_password):
+        return False
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_password_pool(), pwd_context.verify, plain_password, hashed_password)
 
 
 # ---------------- REFRESH TOKEN ----------------
@@ -149,20 +213,107 @@ async def logout_user(access_token: str, db: AsyncSession):
         raise HTTPException(status_code=401, detail="Invalid token")
 
 
-# ---------------- OTP RESET AFTER EXPIRY ----------------
-# ---------------- OTP RESET AFTER EXPIRY ----------------
-# ---------------- OTP RESET AFTER EXPIRY ----------------
-async def reset_otp_after_expiry(user_id: int):
+# ---------------- OTP EXPIRY ----------------
+class OtpExpiryScheduler:
     """
-    Resets the user's OTP after expiry time (auto-expire).
+    Deletes user_otps rows once they expire, for every pending user, from a single task.
+
+    Pending expiries are (due, userid) tuples in a heap. The task sleeps until the
+    earliest one is due, or until an earlier one is scheduled, then expires all the
+    due users in batched DELETEs. user_otps.expires_at is the durable record: it is
+    indexed, the heap is filled from it at startup, and every OTP_EXPIRY_SWEEP_SECONDS
+    an indexed sweep expires what isn't in this worker's heap (OTPs issued by other
+    workers, or by a worker that died). verify_otp checks expires_at itself, so
+    running late never lets an expired OTP through.
     """
-    await asyncio.sleep(settings.OTP_EXPIRE_TIME * 60)
 
-    async with SessionLocal() as db:   # create a fresh session
-        user = await db.get(User, user_id)
-        if user and user.password:
-            user.password = None
-            user.otp_expiry = None
+    def __init__(self):
+        self._heap: List[Tuple[datetime, int]] = []
+        self._wake = asyncio.Event()
+
+    def schedule(self, user_id: int, due_at: datetime) -> None:
+        heapq.heappush(self._heap, (due_at, user_id))
+        if self._heap[0] == (due_at, user_id):
+            self._wake.set()
+
+    async def _expire(self, user_ids: List[int]) -> int:
+        async with SessionLocal() as db:
+            # Re-check the due time: the user may have been sent a new OTP since
+            result = await db.execute(
+                delete(UserOtp)
+                .where(UserOtp.user_id.in_(user_ids), UserOtp.expires_at <= datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
             await db.commit()
-            print(f"OTP expired for user {user.email or user.phone_number}")
-
+        return result.rowcount
+
+    async def expire_due(self) -> int:
+        now = datetime.utcnow()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap)[1])
+        expired = 0
+        for i in range(0, len(due), settings.OTP_EXPIRY_BATCH_SIZE):
+            expired += await self._expire(due[i:i + settings.OTP_EXPIRY_BATCH_SIZE])
+        return expired
+
+    async def sweep(self) -> int:
+        """
+        Expire every overdue OTP in the table, batch by batch through the expires_at index.
+        """
+        expired = 0
+        while True:
+            async with SessionLocal() as db:
+                result = await db.execute(
+                    select(UserOtp.user_id)
+                    .where(UserOtp.expires_at <= datetime.utcnow())
+                    .order_by(UserOtp.expires_at)
+                    .limit(settings.OTP_EXPIRY_BATCH_SIZE)
+                )
+                user_ids = result.scalars().all()
+            if user_ids:
+                expired += await self._expire(user_ids)
+            if len(user_ids) < settings.OTP_EXPIRY_BATCH_SIZE:
+                return expired
+
+    async def load(self) -> None:
+        """
+        Expire what came due while no worker was running, then queue the rest.
+        """
+        await self.sweep()
+        async with SessionLocal() as db:
+            result = await db.execute(select(UserOtp.expires_at, UserOtp.user_id))
+            pending = result.all()
+        for due_at, user_id in pending:
+            heapq.heappush(self._heap, (due_at, user_id))
+
+    async def run(self) -> None:
+        """
+        Background loop started from the app lifespan.
+        """
+        try:
+            await self.load()
+        except Exception as e:
+            print(f"OTP expiry load failed: {e}")
+        next_sweep = time.monotonic() + settings.OTP_EXPIRY_SWEEP_SECONDS
+        while True:
+            self._wake.clear()
+            timeout = next_sweep - time.monotonic()
+            if self._heap:
+                timeout = min(timeout, (self._heap[0][0] - datetime.utcnow()).total_seconds())
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), max(timeout, 0))
+
+            try:
+                expired = await self.expire_due()
+                if time.monotonic() >= next_sweep:
+                    next_sweep = time.monotonic() + settings.OTP_EXPIRY_SWEEP_SECONDS
+                    expired += await self.sweep()
+                if expired:
+                    print(f"OTP expiry removed {expired} expired OTPs")
+            except Exception as e:
+                # Users popped from the heap are picked up again by the next sweep
+                print(f"OTP expiry failed: {e}")
+
+
+otp_expiry_scheduler = OtpExpiryScheduler()
@@ -1,7 +1,15 @@
+import asyncio
+import time
+from typing import Optional
+
+from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from app.config import settings
+from app.databaseConfigs.database import SessionLocal
 from app.databaseConfigs.models.authServiceModel.blacklist import BlacklistedToken
 from app.authService.schemas.blacklist import BlacklistTokenCreate
+from app.authService.auth.revocation import revocation_filter
 from datetime import datetime
 
 
@@ -9,28 +17,78 @@ async def add_token_to_blacklist(db: AsyncSession, token_data: BlacklistTokenCre
     blacklist_token = BlacklistedToken(jti=token_data.jti, expires_at=token_data.expires_at)
     db.add(blacklist_token)
     await db.commit()
+    revocation_filter.add(blacklist_token.jti, blacklist_token.expires_at)
     await db.refresh(blacklist_token)
     return blacklist_token
 
 
 async def is_token_blacklisted(db: AsyncSession, jti: str) -> bool:
-    result = await db.execute(select(BlacklistedToken).where(BlacklistedToken.jti == jti))
-    token = result.scalars().first()
-    if token:
-        # Optionally remove expired tokens here
-        if token.is_expired():
-            await db.delete(token)
+    # Read-only: expired rows are left for the reaper
+    result = await db.execute(
+        select(BlacklistedToken.id).where(BlacklistedToken.jti == jti, BlacklistedToken.expires_at > datetime.utcnow())
+    )
+    return result.first() is not None
+
+
+# ----- REAPER -----
+
+reaper_stats = {
+    "runs": 0,
+    "failures": 0,
+    "deleted_total": 0,
+    "last_deleted": 0,
+    "last_duration_ms": None,
+    "last_run_at": None,
+}
+
+
+async def reap_expired_tokens(batch_size: Optional[int] = None) -> int:
+    """
+    Delete rows past expires_at, `batch_size` per transaction so no single statement
+    holds locks on a large range. Each batch picks its ids through the expires_at
+    index (DELETE ... WHERE id IN (SELECT ... WHERE expires_at < now LIMIT n)).
+    Returns the number of rows deleted.
+    """
+    batch_size = batch_size or settings.TOKEN_BLACKLIST_REAP_BATCH_SIZE
+    cutoff = datetime.utcnow()
+    deleted = 0
+    while True:
+        async with SessionLocal() as db:
+            candidates = (
+                select(BlacklistedToken.id)
+                .where(BlacklistedToken.expires_at < cutoff)
+                .order_by(BlacklistedToken.expires_at)
+                .limit(batch_size)
+            )
+            result = await db.execute(
+                delete(BlacklistedToken)
+                .where(BlacklistedToken.id.in_(candidates))
+                .execution_options(synchronize_session=False)
+            )
             await db.commit()
-            return False
-        return True
-    return False
-
-
-async def cleanup_expired_tokens(db: AsyncSession):
-    """Optional: Periodic task to delete expired tokens."""
-    result = await db.execute(select(BlacklistedToken))
-    tokens = result.scalars().all()
-    for token in tokens:
-        if token.is_expired():
-            await db.delete(token)
-    await db.commit()
+
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            break
+    return deleted
+
+
+async def run_blacklist_reaper() -> None:
+    """
+    Background loop started from the app lifespan.
+    """
+    while True:
+        started = time.perf_counter()
+        try:
+            deleted = await reap_expired_tokens()
+            reaper_stats["last_deleted"] = deleted
+            reaper_stats["deleted_total"] += deleted
+            if deleted:
+                print(f"Blacklist reaper deleted {deleted} expired tokens")
+        except Exception as e:
+            reaper_stats["failures"] += 1
+            print(f"Blacklist reaper failed: {e}")
+        reaper_stats["runs"] += 1
+        reaper_stats["last_duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        reaper_stats["last_run_at"] = datetime.utcnow().isoformat()
+        await asyncio.sleep(settings.TOKEN_BLACKLIST_REAP_INTERVAL_SECONDS)
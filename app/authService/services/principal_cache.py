@@ -0,0 +1,42 @@
+import json
+
+from app.config import settings
+from app.databaseConfigs.models.authServiceModel.user import User
+from app.utils.cache import LRUCache, ReadThroughCache
+
+# What get_current_user hands to routes: the users row without the password
+PRINCIPAL_FIELDS = ("userid", "phone_number", "email", "name", "address", "role")
+
+# Serialized principals keyed by token subject (email or phone number)
+principal_cache = ReadThroughCache(
+    "principal",
+    LRUCache(
+        max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+        ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    ),
+    # Principals are loaded on the read session, which may be a lagging replica
+    settle_seconds=settings.READ_YOUR_WRITES_SECONDS if settings.DATABASE_REPLICA_URLS else 0,
+)
+
+
+def dump_principal(user: User) -> bytes:
+    return json.dumps({field: getattr(user, field) for field in PRINCIPAL_FIELDS}).encode()
+
+
+def load_principal(value: bytes) -> User:
+    # Transient and detached: a fresh object per request, so routes can't mutate the cached copy
+    return User(**json.loads(value))
+
+
+def principal_keys(user: User) -> list:
+    return [identifier for identifier in (user.email, user.phone_number) if identifier]
+
+
+async def invalidate_principal(*keys: str) -> None:
+    """
+    Drop cached principals by subject. Call after committing any change to a user's
+    role or identifiers, with the old identifiers as well as the new ones; other
+    workers keep theirs until PRINCIPAL_CACHE_TTL_SECONDS runs out.
+    """
+    if keys:
+        await principal_cache.invalidate(*keys)
@@ -1,5 +1,6 @@
 import os
 from pathlib import Path
+from typing import List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # Get base directory of this config.py file
@@ -28,6 +29,82 @@ class Settings(BaseSettings):
     ALGORITHM: str
     LOG_LEVEL: str = "info"
     OTP_EXPIRE_TIME: int
+    OTP_EXPIRY_SWEEP_SECONDS: int = 300
+    OTP_EXPIRY_BATCH_SIZE: int = 500
+    # HMAC key for stored OTP digests; derived from JWT_SECRET_KEY when unset
+    OTP_HMAC_KEY: Optional[str] = None
+    # bcrypt runs on this many threads (admin password checks)
+    PASSWORD_HASH_WORKERS: int = 2
+
+    # Database engine. Pool limits are per worker process: keep
+    # workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) under the server's max_connections.
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT_SECONDS: float = 10.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # asyncpg prepared statement caches; set to 0 behind PgBouncer in transaction mode
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_CONNECT_TIMEOUT_SECONDS: float = 5.0
+
+    # Read replicas (JSON list in the env, e.g. DATABASE_REPLICA_URLS='["postgresql+asyncpg://..."]')
+    DATABASE_REPLICA_URLS: List[str] = []
+    REPLICA_EJECT_SECONDS: float = 30.0
+    # After a client writes, its reads stay on the primary this long
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # In-memory token revocation filter (per worker)
+    TOKEN_REVOCATION_SYNC_SECONDS: float = 5.0
+    TOKEN_REVOCATION_REBUILD_SECONDS: int = 3600
+    TOKEN_REVOCATION_FALSE_POSITIVE_RATE: float = 0.01
+    TOKEN_REVOCATION_EXACT_MAX: int = 10000
+
+    # Principal cache for get_current_user (per worker). Role and identifier changes
+    # made through another worker take up to the TTL to apply here.
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+
+    # Expired blacklisted_tokens rows are deleted in the background
+    TOKEN_BLACKLIST_REAP_INTERVAL_SECONDS: int = 300
+    TOKEN_BLACKLIST_REAP_BATCH_SIZE: int = 1000
+
+    # Product detail cache
+    PRODUCT_CACHE_TTL_SECONDS: int = 60
+    PRODUCT_CACHE_MAX_ENTRIES: int = 2048
+    PRODUCT_COMPRESSED_CACHE_MAX_ENTRIES: int = 2048
+    PRODUCT_CACHE_SHARED: bool = False
+    # How long each worker reuses the catalog version it read. Catalog lists can be up to
+    # this stale after a write on another worker (their ETags are weak for that reason).
+    CATALOG_VERSION_TTL_SECONDS: float = 2.0
+
+    # Uploads
+    MAX_UPLOAD_SIZE_BYTES: int = 10 * 1024 * 1024
+    # Whole multipart request (thumbnail plus images), enforced before it is spooled
+    MAX_UPLOAD_REQUEST_BYTES: int = 64 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE_BYTES: int = 256 * 1024
+    # Unreferenced blobs are kept this long before the GC may delete them
+    UPLOAD_GC_GRACE_SECONDS: int = 3600
+    UPLOAD_GC_INTERVAL_SECONDS: int = 900
+    UPLOAD_GC_BATCH_SIZE: int = 500
+    # Behind nginx: internal location aliased to the upload directory, e.g. "/_uploads".
+    # When set, upload bodies are sent by nginx (sendfile) via X-Accel-Redirect.
+    STATIC_ACCEL_REDIRECT_PREFIX: Optional[str] = None
+
+    # Stock reservations
+    STOCK_RESERVATION_TTL_SECONDS: int = 600
+    STOCK_RESERVATION_SWEEP_INTERVAL_SECONDS: int = 30
+    STOCK_RESERVATION_SWEEP_BATCH_SIZE: int = 500
+
+    # Response compression
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+
+    # Image variants
+    IMAGE_VARIANT_WIDTHS: List[int] = [320, 640, 1024]
+    IMAGE_VARIANT_QUALITY: int = 80
+    IMAGE_PROCESS_WORKERS: int = 2
 
     model_config = SettingsConfigDict(
         env_file=str(env_file_path),
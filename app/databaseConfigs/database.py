@@ -1,13 +1,151 @@
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.config import settings
+from app.databaseConfigs.replicas import ReplicaSet, primary_reads_required
 from typing import AsyncGenerator
 
-engine = create_async_engine(settings.DATABASE_URL, future=True, echo=True)
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    The default async queue pool, plus counters for checkouts that had to wait
+    for a connection to be returned (pool and overflow both exhausted).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.timeouts = 0
+        # Checkouts currently blocked on the queue (the async queue yields before it pops)
+        self._pending = 0
+
+    def _do_get(self):
+        if not -1 < self._max_overflow <= self._overflow:
+            return super()._do_get()
+
+        self._pending += 1
+        # More callers in line than idle connections: this one waits for a return
+        waiting = self._pool.qsize() < self._pending
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self._pending -= 1
+            if waiting:
+                self.waits += 1
+                self.wait_seconds += time.perf_counter() - started
+
+
+def _engine_options(database_url: str) -> dict:
+    options = {
+        "future": True,
+        "echo": settings.DB_ECHO,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    }
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory SQLite lives in a single connection; keep SQLAlchemy's static pool
+        return options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        # Reuse the most recent connection so idle extras age out via pool_recycle
+        pool_use_lifo=True,
+    )
+    if url.get_backend_name() == "postgresql" and url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            # Fail fast on an unreachable host so a dead replica is ejected quickly
+            "timeout": settings.DB_CONNECT_TIMEOUT_SECONDS,
+        }
+    return options
+
+
+engine = create_async_engine(settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL))
 SessionLocal = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 Base = declarative_base()
 
+# Optional read replicas, used by get_read_db
+replicas = ReplicaSet(
+    [create_async_engine(url, **_engine_options(url)) for url in settings.DATABASE_REPLICA_URLS],
+    eject_seconds=settings.REPLICA_EJECT_SECONDS,
+)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with SessionLocal() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for read-only routes: a healthy replica, round-robin, or the primary when
+    there are none, all are ejected, or this client just wrote (read-your-writes).
+    """
+    replica = None if primary_reads_required() else replicas.pick()
+    if replica is not None:
+        session = AsyncSession(bind=replica, expire_on_commit=False)
+        try:
+            # Check out now so an unreachable replica is ejected before the route runs
+            await session.connection()
+        except (exc.DBAPIError, OSError) as e:
+            await session.close()
+            replicas.eject(replica, e)
+            replica = None
+
+    if replica is None:
+        async with SessionLocal() as session:
+            yield session
+        return
+
+    try:
+        yield session
+    except exc.DBAPIError as e:
+        if e.connection_invalidated:
+            replicas.eject(replica, e)
+        raise
+    finally:
+        await session.close()
+
+
+def _pool_stats(pool) -> dict:
+    stats = {"pool_class": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update(
+            size=pool.size(),
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            timeout_seconds=pool.timeout(),
+        )
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(
+            waits=pool.waits,
+            wait_seconds=round(pool.wait_seconds, 3),
+            timeouts=pool.timeouts,
+        )
+    return stats
+
+
+def pool_stats() -> dict:
+    stats = _pool_stats(engine.pool)
+    if replicas.engines:
+        stats["replicas"] = [
+            {**health, **_pool_stats(replica.pool)}
+            for health, replica in zip(replicas.stats(), replicas.engines)
+        ]
+    return stats
@@ -0,0 +1,137 @@
+"""
+Versioned schema migrations.
+
+Each module in `versions` defines VERSION (consecutive from 1), a docstring
+describing the change, and `async def upgrade(conn)`. Every migration runs in its
+own transaction together with its schema_migrations row. Steps are written to be
+idempotent, so a database first built by create_all can be brought under version
+control by running them all.
+
+Migrations never import models or services: each one spells out the tables, columns
+and indexes as they were when it was released (sa.Table on its own MetaData, or SQL),
+so later model changes can't alter what an old migration does. Schema changes go in a
+new migration; released ones are not edited.
+
+    python -m app.databaseConfigs.migrations            # apply pending migrations
+    python -m app.databaseConfigs.migrations status
+"""
+import importlib
+import pkgutil
+from datetime import datetime
+from types import ModuleType
+from typing import List
+
+from sqlalchemy import Column, DateTime, Index, Integer, MetaData, String, Table, func, inspect, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.databaseConfigs.migrations import versions
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False, default=datetime.utcnow),
+)
+
+
+class SchemaVersionError(RuntimeError):
+    pass
+
+
+def load_migrations() -> List[ModuleType]:
+    modules = [
+        importlib.import_module(f"{versions.__name__}.{info.name}")
+        for info in pkgutil.iter_modules(versions.__path__)
+    ]
+    modules.sort(key=lambda module: module.VERSION)
+    for expected, module in enumerate(modules, start=1):
+        if module.VERSION != expected:
+            raise SchemaVersionError(f"Migration {module.__name__} has VERSION {module.VERSION}, expected {expected}")
+    return modules
+
+
+def latest_version() -> int:
+    return len(load_migrations())
+
+
+async def current_version(conn: AsyncConnection) -> int:
+    exists = await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table(schema_migrations.name))
+    if not exists:
+        return 0
+    result = await conn.execute(select(func.max(schema_migrations.c.version)))
+    return result.scalar() or 0
+
+
+async def check_schema_version(conn: AsyncConnection) -> None:
+    """
+    Startup check: one query, no DDL. Refuses to start against a schema older than
+    this build; a newer schema (mid rolling deploy) only logs a warning.
+    """
+    current, latest = await current_version(conn), latest_version()
+    if current < latest:
+        raise SchemaVersionError(
+            f"Database schema is at version {current}, this build needs {latest}. "
+            "Run `python -m app.databaseConfigs.migrations` first."
+        )
+    if current > latest:
+        print(f"Database schema is at version {current}, newer than this build ({latest})")
+
+
+async def upgrade(engine: AsyncEngine) -> List[int]:
+    """
+    Apply pending migrations in order; returns the versions applied.
+    """
+    applied = []
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: schema_migrations.create(sync_conn, checkfirst=True))
+
+    for module in load_migrations():
+        async with engine.begin() as conn:
+            if conn.dialect.name == "postgresql":
+                # Serialize concurrent runs (e.g. several deploy jobs) per migration
+                await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": 0x5C4E3A})
+            if module.VERSION <= await current_version(conn):
+                continue
+            await module.upgrade(conn)
+            await conn.execute(schema_migrations.insert().values(
+                version=module.VERSION,
+                name=module.__name__.rsplit(".", 1)[-1],
+                applied_at=datetime.utcnow(),
+            ))
+        applied.append(module.VERSION)
+        print(f"Applied migration {module.VERSION}: {(module.__doc__ or '').strip()}")
+    return applied
+
+
+# ----- helpers for migration modules -----
+
+async def has_column(conn: AsyncConnection, table_name: str, column_name: str) -> bool:
+    def check(sync_conn) -> bool:
+        return any(column["name"] == column_name for column in inspect(sync_conn).get_columns(table_name))
+    return await conn.run_sync(check)
+
+
+async def add_column(conn: AsyncConnection, table_name: str, column: Column) -> None:
+    """
+    ALTER TABLE ... ADD COLUMN for `column`, unless the table already has it.
+    """
+    if await has_column(conn, table_name, column.name):
+        return
+    column_type = column.type.compile(dialect=conn.dialect)
+    null = "" if column.nullable else " NOT NULL"
+    await conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column.name} {column_type}{null}"))
+
+
+async def create_indexes(conn: AsyncConnection, *indexes: Index) -> None:
+    for index in indexes:
+        await conn.run_sync(lambda sync_conn, index=index: index.create(sync_conn, checkfirst=True))
+
+
+async def create_tables(conn: AsyncConnection, *tables: Table) -> None:
+    """
+    Create `tables` (with their indexes) that don't exist yet. Tables referenced only by
+    foreign keys can be declared as stubs on the same MetaData; they are not created.
+    """
+    for table in tables:
+        await conn.run_sync(lambda sync_conn, table=table: table.create(sync_conn, checkfirst=True))
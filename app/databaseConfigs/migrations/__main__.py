@@ -0,0 +1,28 @@
+import argparse
+import asyncio
+
+from app.databaseConfigs.database import engine
+from app.databaseConfigs.migrations import current_version, latest_version, upgrade
+
+
+async def run(command: str) -> None:
+    try:
+        if command == "upgrade":
+            applied = await upgrade(engine)
+            if not applied:
+                print("Schema is up to date")
+        async with engine.connect() as conn:
+            print(f"Schema version {await current_version(conn)} (latest {latest_version()})")
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Apply or inspect schema migrations")
+    parser.add_argument("command", nargs="?", choices=["upgrade", "status"], default="upgrade")
+    args = parser.parse_args()
+    asyncio.run(run(args.command))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Users, blacklisted tokens, categories, products and sizes"""
+from sqlalchemy import JSON, Boolean, Column, DateTime, Enum, ForeignKey, Integer, MetaData, Numeric, String, Table
+
+from app.databaseConfigs.migrations import create_tables
+
+VERSION = 1
+
+metadata = MetaData()
+
+users = Table(
+    "users",
+    metadata,
+    Column("userid", Integer, primary_key=True, index=True),
+    Column("phone_number", String, unique=True, nullable=False),
+    Column("email", String, unique=True, nullable=False),
+    Column("password", String, nullable=False),
+    Column("name", String, nullable=False),
+    Column("address", JSON, nullable=True),
+    Column("role", Enum("admin", "developer", "user", "seller", "logistic", name="roleenum")),
+    Column("otp_expiry", DateTime, nullable=True),
+)
+
+blacklisted_tokens = Table(
+    "blacklisted_tokens",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("jti", String, unique=True, nullable=False),
+    Column("expires_at", DateTime, nullable=False),
+    Column("blacklisted_at", DateTime),
+)
+
+categories = Table(
+    "categories",
+    metadata,
+    Column("id", String, primary_key=True),
+    Column("name", String, nullable=False, unique=True),
+    Column("description", String),
+)
+
+products = Table(
+    "products",
+    metadata,
+    Column("id", String, primary_key=True),
+    Column("sku", Integer, nullable=False),
+    Column("name", String, nullable=False),
+    Column("thumbnail", String, nullable=False),
+    Column("images", JSON, nullable=True),
+    Column("description", String),
+    Column("price", Numeric(10, 2), nullable=False),
+    Column("cost_price", Numeric(10, 2), nullable=False),
+    Column("discount", Integer),
+    Column("max_discount", Integer),
+    Column("gender", String),
+    Column("age_group", String),
+    Column("max_order_count", Integer),
+    Column("is_active", Boolean),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+product_sizes = Table(
+    "product_sizes",
+    metadata,
+    Column("id", String, primary_key=True),
+    Column("product_id", String, ForeignKey("products.id"), nullable=False),
+    Column("size", String, nullable=False),
+    Column("stock", Integer, nullable=False),
+    Column("additional_price", Numeric(10, 2)),
+)
+
+product_categories = Table(
+    "product_categories",
+    metadata,
+    Column("product_id", String, ForeignKey("products.id"), primary_key=True),
+    Column("category_id", String, ForeignKey("categories.id"), primary_key=True),
+)
+
+
+async def upgrade(conn):
+    await create_tables(conn, users, blacklisted_tokens, categories, products, product_sizes, product_categories)
@@ -0,0 +1,19 @@
+"""Keyset pagination and listing filter indexes"""
+from sqlalchemy import text
+
+VERSION = 2
+
+STATEMENTS = [
+    "CREATE INDEX IF NOT EXISTS ix_products_created_at_id ON products (created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_products_gender_age_group ON products (gender, age_group)",
+    "CREATE INDEX IF NOT EXISTS ix_products_discount_id ON products (discount, id)",
+    "CREATE INDEX IF NOT EXISTS ix_products_price_id ON products (price, id)",
+    "CREATE INDEX IF NOT EXISTS ix_product_categories_category_id_product_id"
+    " ON product_categories (category_id, product_id)",
+    "CREATE INDEX IF NOT EXISTS ix_product_sizes_product_id_size ON product_sizes (product_id, size)",
+]
+
+
+async def upgrade(conn):
+    for statement in STATEMENTS:
+        await conn.execute(text(statement))
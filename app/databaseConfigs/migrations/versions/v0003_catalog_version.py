@@ -0,0 +1,22 @@
+"""Catalog version counter, seeded so writers only ever need an UPDATE"""
+from sqlalchemy import BigInteger, Column, Integer, MetaData, Table, select
+
+from app.databaseConfigs.migrations import create_tables
+
+VERSION = 3
+
+CATALOG_VERSION_ID = 1
+
+catalog_version = Table(
+    "catalog_version",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("version", BigInteger, nullable=False),
+)
+
+
+async def upgrade(conn):
+    await create_tables(conn, catalog_version)
+    result = await conn.execute(select(catalog_version.c.id).where(catalog_version.c.id == CATALOG_VERSION_ID))
+    if result.scalar_one_or_none() is None:
+        await conn.execute(catalog_version.insert().values(id=CATALOG_VERSION_ID, version=0))
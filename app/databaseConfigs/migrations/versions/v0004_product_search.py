@@ -0,0 +1,52 @@
+"""Full-text product search (tsvector + GIN on Postgres, FTS5 on SQLite)"""
+from sqlalchemy import text
+
+VERSION = 4
+
+# Postgres: a generated tsvector column with a GIN index
+POSTGRES_DDL = [
+    """
+    ALTER TABLE products ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_products_search_vector ON products USING GIN (search_vector)",
+]
+
+# SQLite: an external-content FTS5 table kept in sync by triggers
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS products_fts
+    USING fts5(name, description, content='products', content_rowid='rowid')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts(rowid, name, description) VALUES (new.rowid, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description)
+        VALUES ('delete', old.rowid, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description)
+        VALUES ('delete', old.rowid, old.name, old.description);
+        INSERT INTO products_fts(rowid, name, description) VALUES (new.rowid, new.name, new.description);
+    END
+    """,
+    "INSERT INTO products_fts(products_fts) VALUES ('rebuild')",
+]
+
+
+async def upgrade(conn):
+    statements = {
+        "postgresql": POSTGRES_DDL,
+        "sqlite": SQLITE_DDL,
+    }.get(conn.dialect.name, [])
+    for statement in statements:
+        await conn.execute(text(statement))
@@ -0,0 +1,10 @@
+"""products.image_variants for resized WebP variants"""
+from sqlalchemy import JSON, Column
+
+from app.databaseConfigs.migrations import add_column
+
+VERSION = 5
+
+
+async def upgrade(conn):
+    await add_column(conn, "products", Column("image_variants", JSON, nullable=True))
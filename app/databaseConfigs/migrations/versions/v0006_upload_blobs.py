@@ -0,0 +1,21 @@
+"""Content-addressed upload blobs with reference counts"""
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, MetaData, String, Table
+
+from app.databaseConfigs.migrations import create_tables
+
+VERSION = 6
+
+upload_blobs = Table(
+    "upload_blobs",
+    MetaData(),
+    Column("path", String, primary_key=True),
+    Column("sha256", String(64), nullable=False),
+    Column("size", BigInteger, nullable=False),
+    Column("ref_count", Integer, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+    Index("ix_upload_blobs_ref_count_updated_at", "ref_count", "updated_at"),
+)
+
+
+async def upgrade(conn):
+    await create_tables(conn, upload_blobs)
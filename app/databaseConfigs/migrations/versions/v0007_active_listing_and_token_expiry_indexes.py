@@ -0,0 +1,13 @@
+"""Active-product listing index and blacklisted token expiry index"""
+from sqlalchemy import text
+
+VERSION = 7
+
+
+async def upgrade(conn):
+    await conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_products_is_active_created_at_id ON products (is_active, created_at, id)"
+    ))
+    await conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_blacklisted_tokens_expires_at ON blacklisted_tokens (expires_at)"
+    ))
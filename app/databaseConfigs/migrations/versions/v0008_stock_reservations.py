@@ -0,0 +1,33 @@
+"""Stock reservations and their per-size items"""
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, MetaData, String, Table
+
+from app.databaseConfigs.migrations import create_tables
+
+VERSION = 8
+
+metadata = MetaData()
+
+# Foreign key targets only; they already exist
+Table("users", metadata, Column("userid", Integer, primary_key=True))
+Table("product_sizes", metadata, Column("id", String, primary_key=True))
+
+stock_reservations = Table(
+    "stock_reservations",
+    metadata,
+    Column("id", String, primary_key=True),
+    Column("user_id", Integer, ForeignKey("users.userid"), nullable=True),
+    Column("expires_at", DateTime, nullable=False, index=True),
+    Column("created_at", DateTime),
+)
+
+stock_reservation_items = Table(
+    "stock_reservation_items",
+    metadata,
+    Column("reservation_id", String, ForeignKey("stock_reservations.id", ondelete="CASCADE"), primary_key=True),
+    Column("product_size_id", String, ForeignKey("product_sizes.id", ondelete="CASCADE"), primary_key=True),
+    Column("quantity", Integer, nullable=False),
+)
+
+
+async def upgrade(conn):
+    await create_tables(conn, stock_reservations, stock_reservation_items)
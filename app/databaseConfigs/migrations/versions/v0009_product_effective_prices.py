@@ -0,0 +1,63 @@
+"""Precomputed min/max effective price on products, indexed for price sort and filters"""
+from decimal import Decimal
+
+from sqlalchemy import Column, Integer, MetaData, Numeric, String, Table, and_, case, func, select, text, update
+
+from app.databaseConfigs.migrations import add_column
+
+VERSION = 9
+
+metadata = MetaData()
+
+products = Table(
+    "products",
+    metadata,
+    Column("id", String, primary_key=True),
+    Column("price", Numeric(10, 2)),
+    Column("discount", Integer),
+    Column("max_discount", Integer),
+    Column("min_effective_price", Numeric(10, 2)),
+    Column("max_effective_price", Numeric(10, 2)),
+)
+
+product_sizes = Table(
+    "product_sizes",
+    metadata,
+    Column("product_id", String),
+    Column("additional_price", Numeric(10, 2)),
+)
+
+# Decimal literal so SQLite divides as real numbers rather than integers
+HUNDRED = Decimal("100")
+
+
+def _effective_price(additional_price=None):
+    # price (+ size surcharge) less the discount, capped by max_discount when one is set
+    discount = case(
+        (and_(products.c.max_discount > 0, products.c.discount > products.c.max_discount), products.c.max_discount),
+        else_=func.coalesce(products.c.discount, 0),
+    )
+    base = products.c.price if additional_price is None else products.c.price + func.coalesce(additional_price, 0)
+    return func.round(base * (HUNDRED - discount) / HUNDRED, 2)
+
+
+def _size_price_rollup(aggregate):
+    return (
+        select(aggregate(_effective_price(product_sizes.c.additional_price)))
+        .where(product_sizes.c.product_id == products.c.id)
+        .scalar_subquery()
+    )
+
+
+async def upgrade(conn):
+    await add_column(conn, "products", Column("min_effective_price", Numeric(10, 2)))
+    await add_column(conn, "products", Column("max_effective_price", Numeric(10, 2)))
+    await conn.execute(update(products).values(
+        min_effective_price=func.coalesce(_size_price_rollup(func.min), _effective_price()),
+        max_effective_price=func.coalesce(_size_price_rollup(func.max), _effective_price()),
+    ))
+    await conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_products_min_effective_price_id ON products (min_effective_price, id)"
+    ))
+    # Listings no longer sort on the raw price
+    await conn.execute(text("DROP INDEX IF EXISTS ix_products_price_id"))
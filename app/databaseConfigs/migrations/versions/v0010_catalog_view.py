@@ -0,0 +1,35 @@
+"""Denormalized catalog_view read model (filled by the rebuild_catalog_view command)"""
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, MetaData, Numeric, String, Table, Text
+
+from app.databaseConfigs.migrations import create_tables
+
+VERSION = 10
+
+catalog_view = Table(
+    "catalog_view",
+    MetaData(),
+    Column("id", String, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("thumbnail", String, nullable=False),
+    Column("price", Numeric(10, 2), nullable=False),
+    Column("discount", Integer),
+    Column("max_discount", Integer),
+    Column("min_effective_price", Numeric(10, 2)),
+    Column("max_effective_price", Numeric(10, 2)),
+    Column("gender", String),
+    Column("age_group", String),
+    Column("is_active", Boolean),
+    Column("created_at", DateTime),
+    Column("body", Text, nullable=False),
+    Index("ix_catalog_view_created_at_id", "created_at", "id"),
+    Index("ix_catalog_view_is_active_created_at_id", "is_active", "created_at", "id"),
+    Index("ix_catalog_view_gender_age_group", "gender", "age_group"),
+    Index("ix_catalog_view_min_effective_price_id", "min_effective_price", "id"),
+    Index("ix_catalog_view_discount_id", "discount", "id"),
+)
+
+
+async def upgrade(conn):
+    # Created empty: rendering rows is service code and belongs to
+    # `python -m app.productService.commands.rebuild_catalog_view`, run after upgrading
+    await create_tables(conn, catalog_view)
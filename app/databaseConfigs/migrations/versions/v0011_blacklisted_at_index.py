@@ -0,0 +1,10 @@
+"""Index on blacklisted_tokens.blacklisted_at for the revocation filter sync"""
+from sqlalchemy import text
+
+VERSION = 11
+
+
+async def upgrade(conn):
+    await conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_blacklisted_tokens_blacklisted_at ON blacklisted_tokens (blacklisted_at)"
+    ))
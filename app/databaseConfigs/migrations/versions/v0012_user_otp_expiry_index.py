@@ -0,0 +1,8 @@
+"""Index on users.otp_expiry for the OTP expiry scheduler"""
+from sqlalchemy import text
+
+VERSION = 12
+
+
+async def upgrade(conn):
+    await conn.execute(text("CREATE INDEX IF NOT EXISTS ix_users_otp_expiry ON users (otp_expiry)"))
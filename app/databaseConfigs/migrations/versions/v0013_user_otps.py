@@ -0,0 +1,29 @@
+"""user_otps table for HMAC OTP digests; OTPs leave users.password and users.otp_expiry"""
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, MetaData, String, Table, text
+
+from app.databaseConfigs.migrations import create_tables
+
+VERSION = 13
+
+metadata = MetaData()
+
+# Foreign key target only; it already exists
+Table("users", metadata, Column("userid", Integer, primary_key=True))
+
+user_otps = Table(
+    "user_otps",
+    metadata,
+    Column("user_id", Integer, ForeignKey("users.userid", ondelete="CASCADE"), primary_key=True),
+    Column("digest", String(64), nullable=False),
+    Column("expires_at", DateTime, nullable=False, index=True),
+    Column("created_at", DateTime),
+)
+
+
+async def upgrade(conn):
+    await create_tables(conn, user_otps)
+    # Pending OTPs are bcrypt hashes in users.password; disable them (users request a
+    # new one). "!" is not a valid hash, so it never verifies.
+    await conn.execute(text("UPDATE users SET password = '!' WHERE otp_expiry IS NOT NULL"))
+    await conn.execute(text("DROP INDEX IF EXISTS ix_users_otp_expiry"))
+    await conn.execute(text("ALTER TABLE users DROP COLUMN otp_expiry"))
@@ -8,8 +8,8 @@ class BlacklistedToken(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     jti = Column(String, unique=True, nullable=False)  # renamed from token to jti
-    expires_at = Column(DateTime, nullable=False)
-    blacklisted_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    blacklisted_at = Column(DateTime, default=datetime.utcnow, index=True)  # revocation filter sync reads by this
 
     def is_expired(self):
         return datetime.utcnow() > self.expires_at
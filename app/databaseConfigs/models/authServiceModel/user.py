@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, JSON, Enum,DateTime
+from sqlalchemy import Column, Integer, String, JSON, Enum
 from app.databaseConfigs.database import Base
 import enum
 from datetime import datetime
@@ -20,4 +20,3 @@ class User(Base):
     name = Column(String, nullable=False)
     address = Column(JSON, nullable=True)
     role = Column(Enum(RoleEnum), default="user")
-    otp_expiry = Column(DateTime, nullable=True)
\ No newline at end of file
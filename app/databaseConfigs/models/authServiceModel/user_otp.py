@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from datetime import datetime
+from app.databaseConfigs.database import Base
+
+
+class UserOtp(Base):
+    """
+    The one outstanding login OTP of a user, as a keyed HMAC digest. The row is deleted
+    when the OTP is used or expires.
+    """
+    __tablename__ = "user_otps"
+
+    user_id = Column(Integer, ForeignKey("users.userid", ondelete="CASCADE"), primary_key=True)
+    digest = Column(String(64), nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)  # OTP expiry scheduler sweeps by this
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, BigInteger
+
+from app.databaseConfigs.database import Base
+
+CATALOG_VERSION_ID = 1
+
+
+class CatalogVersion(Base):
+    """
+    Single-row counter bumped by every catalog write; list ETags are derived from it.
+    """
+    __tablename__ = "catalog_version"
+
+    id = Column(Integer, primary_key=True, default=CATALOG_VERSION_ID)
+    version = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, String, Integer, Numeric, Boolean, DateTime, Text, Index
+
+from app.databaseConfigs.database import Base
+
+
+class CatalogView(Base):
+    """
+    Denormalized read model: one row per product holding its ProductListing JSON
+    (categories and sizes embedded, stock left out) plus the columns catalog listings
+    filter and sort on. Written only by services.catalog_view, in the same transaction
+    as the change.
+    """
+    __tablename__ = "catalog_view"
+
+    id = Column(String, primary_key=True)  # products.id
+    name = Column(String, nullable=False)
+    thumbnail = Column(String, nullable=False)
+    price = Column(Numeric(10, 2), nullable=False)
+    discount = Column(Integer)
+    max_discount = Column(Integer)
+    min_effective_price = Column(Numeric(10, 2))
+    max_effective_price = Column(Numeric(10, 2))
+    gender = Column(String)
+    age_group = Column(String)
+    is_active = Column(Boolean)
+    created_at = Column(DateTime)
+    body = Column(Text, nullable=False)
+
+    __table_args__ = (
+        # Same access paths as the listing indexes on products
+        Index("ix_catalog_view_created_at_id", "created_at", "id"),
+        Index("ix_catalog_view_is_active_created_at_id", "is_active", "created_at", "id"),
+        Index("ix_catalog_view_gender_age_group", "gender", "age_group"),
+        Index("ix_catalog_view_min_effective_price_id", "min_effective_price", "id"),
+        Index("ix_catalog_view_discount_id", "discount", "id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column,JSON, String, Integer, Numeric, Boolean, ForeignKey, DateTime, Table
+from sqlalchemy import Column,JSON, String, Integer, Numeric, Boolean, ForeignKey, DateTime, Table, Index, DDL, event
 from sqlalchemy.orm import relationship
 from uuid import uuid4
 from datetime import datetime
@@ -10,7 +10,9 @@ product_categories = Table(
     "product_categories",
     Base.metadata,
     Column("product_id", String, ForeignKey("products.id"), primary_key=True),
-    Column("category_id", String, ForeignKey("categories.id"), primary_key=True)
+    Column("category_id", String, ForeignKey("categories.id"), primary_key=True),
+    # Category listings look up links by category first; the PK only covers product_id first
+    Index("ix_product_categories_category_id_product_id", "category_id", "product_id"),
 )
 
 class Product(Base):
@@ -21,12 +23,18 @@ class Product(Base):
     name = Column(String, nullable=False)
     thumbnail = Column(String, nullable=False)
     images = Column(JSON, nullable=True)
+    # {original path: {"320w": variant path, ...}} for thumbnail and images
+    image_variants = Column(JSON, nullable=True)
     description = Column(String)
 
     price = Column(Numeric(10, 2), nullable=False)
     cost_price = Column(Numeric(10, 2), nullable=False)
     discount = Column(Integer, default=0)
     max_discount = Column(Integer)
+    # What a customer pays across the product's sizes, after the capped discount.
+    # Maintained by services.pricing.refresh_effective_prices on every price or size write.
+    min_effective_price = Column(Numeric(10, 2))
+    max_effective_price = Column(Numeric(10, 2))
 
     gender = Column(String)  # e.g., Male, Female, Unisex
     age_group = Column(String)  # e.g., Kids, Adults
@@ -40,3 +48,67 @@ class Product(Base):
     # Relationships
     categories = relationship("Category", secondary=product_categories, back_populates="products")
     sizes = relationship("ProductSize", back_populates="product", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Keyset pagination orders on (created_at, id)
+        Index("ix_products_created_at_id", "created_at", "id"),
+        # The same order restricted to active products (storefront listings)
+        Index("ix_products_is_active_created_at_id", "is_active", "created_at", "id"),
+        # Listing filters and sort options
+        Index("ix_products_gender_age_group", "gender", "age_group"),
+        # Price sort and range filters use the cheapest size's effective price
+        Index("ix_products_min_effective_price_id", "min_effective_price", "id"),
+        Index("ix_products_discount_id", "discount", "id"),
+    )
+
+
+# ----- FULL-TEXT SEARCH -----
+# Postgres: a generated tsvector column (kept current by the database itself) with a GIN index.
+# The column is added through DDL rather than mapped, so the model stays portable.
+PRODUCT_SEARCH_POSTGRES_DDL = [
+    """
+    ALTER TABLE products ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_products_search_vector ON products USING GIN (search_vector)",
+]
+
+# SQLite (local runs): an external-content FTS5 table kept in sync by triggers.
+PRODUCT_SEARCH_SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS products_fts
+    USING fts5(name, description, content='products', content_rowid='rowid')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts(rowid, name, description) VALUES (new.rowid, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description)
+        VALUES ('delete', old.rowid, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description)
+        VALUES ('delete', old.rowid, old.name, old.description);
+        INSERT INTO products_fts(rowid, name, description) VALUES (new.rowid, new.name, new.description);
+    END
+    """,
+    "INSERT INTO products_fts(products_fts) VALUES ('rebuild')",
+]
+
+for _statement in PRODUCT_SEARCH_POSTGRES_DDL:
+    event.listen(Product.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _statement in PRODUCT_SEARCH_SQLITE_DDL:
+    event.listen(Product.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(
+    Product.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS products_fts").execute_if(dialect="sqlite"),
+)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, Numeric
+from sqlalchemy import Column, String, Integer, ForeignKey, Numeric, Index
 from sqlalchemy.orm import relationship
 from uuid import uuid4
 
@@ -14,3 +14,8 @@ class ProductSize(Base):
     additional_price = Column(Numeric(10, 2), default=0.00)
 
     product = relationship("Product", back_populates="sizes")
+
+    __table_args__ = (
+        # Size lookups per product and the "in stock in size X" filter
+        Index("ix_product_sizes_product_id_size", "product_id", "size"),
+    )
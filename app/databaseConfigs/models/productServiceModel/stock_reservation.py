@@ -0,0 +1,29 @@
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime
+from sqlalchemy.orm import relationship
+from uuid import uuid4
+from datetime import datetime
+
+from app.databaseConfigs.database import Base
+
+
+class StockReservation(Base):
+    """
+    Stock held for a buyer until it is confirmed, released, or swept after expires_at.
+    The held quantities are already subtracted from product_sizes.stock.
+    """
+    __tablename__ = "stock_reservations"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid4()))
+    user_id = Column(Integer, ForeignKey("users.userid"), nullable=True)
+    expires_at = Column(DateTime, nullable=False, index=True)  # the sweeper scans by expiry
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    items = relationship("StockReservationItem", cascade="all, delete-orphan", lazy="selectin")
+
+
+class StockReservationItem(Base):
+    __tablename__ = "stock_reservation_items"
+
+    reservation_id = Column(String, ForeignKey("stock_reservations.id", ondelete="CASCADE"), primary_key=True)
+    product_size_id = Column(String, ForeignKey("product_sizes.id", ondelete="CASCADE"), primary_key=True)
+    quantity = Column(Integer, nullable=False)
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, Index
+from datetime import datetime
+
+from app.databaseConfigs.database import Base
+
+
+class UploadBlob(Base):
+    """
+    One stored upload, named by the SHA-256 of its content. ref_count is the number of
+    products whose thumbnail or images point at it; blobs left at zero past the grace
+    period are removed by the upload GC.
+    """
+    __tablename__ = "upload_blobs"
+
+    path = Column(String, primary_key=True)
+    sha256 = Column(String(64), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    # Touched on every upload and reference change; the GC grace period counts from here
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_upload_blobs_ref_count_updated_at", "ref_count", "updated_at"),
+    )
@@ -0,0 +1,135 @@
+import itertools
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+# Clients that wrote within the read-your-writes window carry this cookie
+# (epoch seconds until which their reads go to the primary)
+READ_PRIMARY_COOKIE = "read_primary_until"
+
+
+class ReplicaSet:
+    """
+    Round-robin over read replicas. A replica that fails a checkout is ejected for
+    REPLICA_EJECT_SECONDS and then tried again; with none healthy, reads use the primary.
+    """
+
+    def __init__(self, engines: List[AsyncEngine], eject_seconds: float):
+        self.engines = engines
+        self.eject_seconds = eject_seconds
+        self._ejected_until: Dict[int, float] = {}
+        self._next = itertools.cycle(range(len(engines)))
+
+    def pick(self) -> Optional[AsyncEngine]:
+        now = time.monotonic()
+        for _ in range(len(self.engines)):
+            index = next(self._next)
+            if self._ejected_until.get(index, 0) <= now:
+                return self.engines[index]
+        return None
+
+    def eject(self, engine: AsyncEngine, error: BaseException) -> None:
+        index = self.engines.index(engine)
+        self._ejected_until[index] = time.monotonic() + self.eject_seconds
+        print(f"Replica {engine.url.render_as_string(hide_password=True)} ejected: {error}")
+
+    def stats(self) -> List[dict]:
+        now = time.monotonic()
+        return [
+            {
+                "url": engine.url.render_as_string(hide_password=True),
+                "healthy": self._ejected_until.get(index, 0) <= now,
+            }
+            for index, engine in enumerate(self.engines)
+        ]
+
+
+# ----- READ-YOUR-WRITES -----
+
+class _RequestState:
+    __slots__ = ("read_primary", "wrote")
+
+    def __init__(self, read_primary: bool):
+        self.read_primary = read_primary
+        self.wrote = False
+
+
+# Mutable per-request state, so a write inside a copied context is still seen here
+_request_state: ContextVar[Optional[_RequestState]] = ContextVar("read_routing_state", default=None)
+
+
+def primary_reads_required() -> bool:
+    state = _request_state.get()
+    return state is not None and (state.read_primary or state.wrote)
+
+
+@event.listens_for(Session, "after_flush")
+def _note_flush(session: Session, flush_context) -> None:
+    session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_write_statement(orm_execute_state) -> None:
+    # Core insert/update/delete run through the session (bulk import, counters)
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _note_commit(session: Session) -> None:
+    if session.info.pop("has_writes", False):
+        state = _request_state.get()
+        if state is not None:
+            state.wrote = True
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_writes(session: Session) -> None:
+    session.info.pop("has_writes", None)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pins a client's reads to the primary for READ_YOUR_WRITES_SECONDS after it commits
+    a write, so replica lag never hides its own changes. The window travels in a cookie;
+    later reads in the request that wrote go to the primary as well.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            read_primary = float(HTTPConnection(scope).cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+        except ValueError:
+            read_primary = False
+        request_state = _RequestState(read_primary)
+        token = _request_state.set(request_state)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and request_state.wrote:
+                until = time.time() + settings.READ_YOUR_WRITES_SECONDS
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{READ_PRIMARY_COOKIE}={until:.0f}; Max-Age={settings.READ_YOUR_WRITES_SECONDS:.0f}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_state.reset(token)
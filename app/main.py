@@ -4,29 +4,67 @@ from app.authService.routes import user
 from app.productService.routes import product
 from app.productService.routes import category
 from app.productService.routes import product_size
+from app.productService.routes import stock_reservation
 from contextlib import asynccontextmanager
-from app.databaseConfigs.database import engine, Base
+from app.databaseConfigs.database import engine
+from app.databaseConfigs.migrations import check_schema_version
 from app.adminService.admin import setup_admin
 from starlette.middleware.sessions import SessionMiddleware
 from app.authService.routes import internal
+from app.authService.auth.revocation import revocation_filter, run_revocation_sync
+from app.authService.services.blacklist import run_blacklist_reaper
+from app.authService.services.auth import otp_expiry_scheduler, shutdown_password_pool
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.static_files import UploadStaticFiles
+from app.utils.compression import CompressionMiddleware
+from app.utils.upload_limit import UploadLimitMiddleware
+from app.databaseConfigs.replicas import ReadYourWritesMiddleware
+from app.productService.services.images import shutdown_image_pool
+from app.productService.services.uploads import run_upload_gc
+from app.productService.services.stock_reservation import run_reservation_sweeper
+from app.productService.services.catalog_view import check_catalog_view
+import asyncio
+import contextlib
 import os
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Run before the application starts
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Schema changes are applied by `python -m app.databaseConfigs.migrations`; only check here
+    async with engine.connect() as conn:
+        await check_schema_version(conn)
+        await check_catalog_view(conn)
+    await revocation_filter.load()
+    background = [
+        asyncio.create_task(run_revocation_sync()),
+        asyncio.create_task(run_blacklist_reaper()),
+        asyncio.create_task(otp_expiry_scheduler.run()),
+        asyncio.create_task(run_upload_gc()),
+        asyncio.create_task(run_reservation_sweeper()),
+    ]
     
     yield  # Yield control to the app
-    
-    # Optionally, add any shutdown logic here
+
+    for task in background:
+        task.cancel()
+    for task in background:
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    shutdown_image_pool()
+    shutdown_password_pool()
 
 app = FastAPI(lifespan=lifespan)
 origins = [
     "http://localhost:5173",   # React local dev 
 ]
+# Innermost, so its 413s still get CORS headers; bulk imports are exempt
+app.add_middleware(
+    UploadLimitMiddleware,
+    max_bytes=settings.MAX_UPLOAD_REQUEST_BYTES,
+    exempt_paths={"/api/v1/products/import"},
+)
 app.add_middleware(SessionMiddleware, secret_key="supersecretkey")
 app.add_middleware(
     CORSMiddleware,
@@ -34,11 +72,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
 # Ensure the directory exists
 os.makedirs("app/static/uploads", exist_ok=True)
 
-# Mount static directory
+# Mount static directory; uploads get immutable caching, variants and precompressed files
+app.mount("/static/uploads", UploadStaticFiles(directory="app/static/uploads"), name="uploads")
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
 print("Running in:", settings.ENVIRONMENT)
@@ -47,5 +89,6 @@ app.include_router(user.router, prefix="/api/v1")
 app.include_router(product.router, prefix="/api/v1")
 app.include_router(category.router, prefix="/api/v1")
 app.include_router(product_size.router, prefix="/api/v1")
+app.include_router(stock_reservation.router, prefix="/api/v1")
 app.include_router(internal.router)
 setup_admin(app)
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+Flash-sale benchmark for stock reservations: many concurrent buyers on one size row.
+Runs against DATABASE_URL (migrated), creates its own throwaway product and removes it.
+
+Checks that no unit is oversold (reserved units == stock taken, stock never below
+zero) and that a bulk release puts every unit back, then reports throughput and latency.
+
+    python -m app.productService.commands.bench_reservations
+    python -m app.productService.commands.bench_reservations --stock 500 --buyers 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from decimal import Decimal
+
+from fastapi import HTTPException
+from sqlalchemy import delete, func
+from sqlalchemy.future import select
+
+from app.databaseConfigs.database import SessionLocal, engine
+from app.databaseConfigs.models.authServiceModel.user import User  # noqa: F401  (reservation FK target)
+from app.databaseConfigs.models.productServiceModel.category import Category  # noqa: F401  (Product relationship)
+from app.databaseConfigs.models.productServiceModel.product import Product
+from app.databaseConfigs.models.productServiceModel.product_size import ProductSize
+from app.databaseConfigs.models.productServiceModel.stock_reservation import (
+    StockReservation,
+    StockReservationItem,
+)
+from app.productService.schemas.stock_reservation import ReservationItem
+from app.productService.services import stock_reservation as reservation_service
+
+
+async def create_fixture(stock: int, max_order_count: int) -> ProductSize:
+    async with SessionLocal() as db:
+        size = ProductSize(size="M", stock=stock, additional_price=Decimal("0.00"))
+        db.add(Product(
+            sku=0,
+            name="Reservation benchmark",
+            thumbnail="",
+            price=Decimal("1.00"),
+            cost_price=Decimal("1.00"),
+            max_order_count=max_order_count,
+            is_active=True,
+            sizes=[size],
+        ))
+        await db.commit()
+        return size
+
+
+async def remove_fixture(size: ProductSize) -> None:
+    async with SessionLocal() as db:
+        reservations = select(StockReservationItem.reservation_id).where(StockReservationItem.product_size_id == size.id)
+        await db.execute(delete(StockReservation).where(StockReservation.id.in_(reservations)))
+        await db.execute(delete(StockReservationItem).where(StockReservationItem.product_size_id == size.id))
+        await db.execute(delete(ProductSize).where(ProductSize.id == size.id))
+        await db.execute(delete(Product).where(Product.id == size.product_id))
+        await db.commit()
+
+
+async def buyer(size_id: str, quantity: int, semaphore: asyncio.Semaphore, latencies: list, outcomes: dict):
+    async with semaphore:
+        started = time.perf_counter()
+        async with SessionLocal() as db:
+            try:
+                reservation = await reservation_service.reserve_stock(
+                    db, [ReservationItem(size_id=size_id, quantity=quantity)]
+                )
+                outcomes["reserved"].append(reservation.id)
+            except HTTPException as e:
+                if e.status_code != 409:
+                    raise
+                outcomes["sold_out"] += 1
+        latencies.append(time.perf_counter() - started)
+
+
+async def read_state(size_id: str):
+    async with SessionLocal() as db:
+        stock = (await db.execute(select(ProductSize.stock).where(ProductSize.id == size_id))).scalar_one()
+        held = (await db.execute(
+            select(func.coalesce(func.sum(StockReservationItem.quantity), 0))
+            .where(StockReservationItem.product_size_id == size_id)
+        )).scalar_one()
+    return stock, held
+
+
+async def run(args) -> None:
+    size = await create_fixture(args.stock, max(args.quantity, 1))
+    try:
+        semaphore = asyncio.Semaphore(args.concurrency)
+        latencies, outcomes = [], {"reserved": [], "sold_out": 0}
+
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            buyer(size.id, args.quantity, semaphore, latencies, outcomes) for _ in range(args.buyers)
+        ))
+        elapsed = time.perf_counter() - started
+
+        stock, held = await read_state(size.id)
+        reserved_units = len(outcomes["reserved"]) * args.quantity
+        expected_units = min(args.stock // args.quantity, args.buyers) * args.quantity
+        oversold = reserved_units > args.stock or stock < 0 or held != reserved_units or stock + held != args.stock
+
+        release_started = time.perf_counter()
+        async with SessionLocal() as db:
+            released = await reservation_service.release_reservations(db, outcomes["reserved"])
+        release_elapsed = time.perf_counter() - release_started
+        restored_stock, _ = await read_state(size.id)
+
+        latencies.sort()
+        print(f"{engine.url.get_backend_name()}: {args.buyers} buyers x {args.quantity} unit(s), "
+              f"stock {args.stock}, concurrency {args.concurrency}")
+        print(f"  reserved      {len(outcomes['reserved'])} ({reserved_units} units), sold out {outcomes['sold_out']}")
+        print(f"  stock left    {stock}, held in reservations {held}")
+        print(f"  throughput    {args.buyers / elapsed:.0f} attempts/s ({elapsed:.2f}s)")
+        print(f"  latency       p50 {statistics.median(latencies) * 1000:.1f} ms, "
+              f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f} ms")
+        print(f"  bulk release  {released} reservations in {release_elapsed * 1000:.1f} ms, stock back to {restored_stock}")
+
+        if oversold:
+            raise SystemExit("FAIL: oversold or lost stock")
+        if reserved_units != expected_units or restored_stock != args.stock:
+            raise SystemExit("FAIL: stock left unsold or not restored")
+        print("  OK: no oversell, every unit accounted for")
+    finally:
+        await remove_fixture(size)
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark concurrent stock reservations")
+    parser.add_argument("--stock", type=int, default=100)
+    parser.add_argument("--buyers", type=int, default=1000)
+    parser.add_argument("--quantity", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
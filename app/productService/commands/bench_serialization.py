@@ -0,0 +1,96 @@
+"""
+Per-item cost of serializing a page of products, the old way versus render_list.
+Runs on in-memory ORM objects, so no database is needed.
+
+    python -m app.productService.commands.bench_serialization
+    python -m app.productService.commands.bench_serialization --page-size 100 --repeat 50
+"""
+import argparse
+import json
+import timeit
+from datetime import datetime
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+
+from app.databaseConfigs.models.productServiceModel.category import Category
+from app.databaseConfigs.models.productServiceModel.product import Product
+from app.databaseConfigs.models.productServiceModel.product_size import ProductSize
+from app.productService.schemas.category import CategoryResponse
+from app.productService.schemas.product import ProductResponse
+from app.productService.schemas.product_size import ProductSizeResponse
+from app.utils.serialization import render_list
+
+
+def build_page(page_size: int):
+    categories = [Category(id=f"category-{i}", name=f"Category {i}", description="Seasonal picks") for i in range(3)]
+    now = datetime.utcnow()
+    products = []
+    for i in range(page_size):
+        path = f"app/static/uploads/blobs/{i:02x}/{i:064x}.jpg"
+        products.append(Product(
+            id=f"product-{i}",
+            sku=1000 + i,
+            name=f"Cotton crew neck tee {i}",
+            thumbnail=path,
+            images=[path, path.replace(".jpg", "-back.jpg")],
+            image_variants={path: {"320w": path.replace(".jpg", "_320w.webp"), "640w": path.replace(".jpg", "_640w.webp")}},
+            description="Soft, breathable everyday tee in combed cotton. " * 4,
+            price=Decimal("499.00") + i,
+            cost_price=Decimal("210.00"),
+            discount=10,
+            max_discount=30,
+            gender="Unisex",
+            age_group="Adults",
+            max_order_count=5,
+            is_active=True,
+            created_at=now,
+            updated_at=now,
+            categories=categories,
+            sizes=[
+                ProductSize(id=f"size-{i}-{size}", size=size, stock=20, additional_price=Decimal("0.00"))
+                for size in ("S", "M", "L", "XL")
+            ],
+        ))
+    sizes = [size for product in products for size in product.sizes]
+    return products, categories, sizes
+
+
+def old_path(model, objects) -> bytes:
+    # ORM -> model per item -> dict -> stdlib JSON
+    items = [model.model_validate(obj, from_attributes=True) for obj in objects]
+    return json.dumps(jsonable_encoder(items), separators=(",", ":")).encode()
+
+
+def per_item_us(fn, model, objects, repeat: int) -> float:
+    timer = timeit.Timer(lambda: fn(model, objects))
+    loops, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=loops)) / loops
+    return best / len(objects) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark list serialization")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    products, categories, sizes = build_page(args.page_size)
+    cases = [
+        ("ProductResponse", ProductResponse, products),
+        ("CategoryResponse", CategoryResponse, categories),
+        ("ProductSizeResponse", ProductSizeResponse, sizes),
+    ]
+
+    print(f"Page of {args.page_size} products (3 categories, 4 sizes each); best of {args.repeat}")
+    print(f"{'model':<22}{'items':>7}{'old us/item':>14}{'new us/item':>14}{'speedup':>10}")
+    for name, model, objects in cases:
+        # Same document either way
+        assert json.loads(old_path(model, objects)) == json.loads(render_list(model, objects))
+        old = per_item_us(old_path, model, objects, args.repeat)
+        new = per_item_us(render_list, model, objects, args.repeat)
+        print(f"{name:<22}{len(objects):>7}{old:>14.2f}{new:>14.2f}{old / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
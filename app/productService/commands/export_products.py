@@ -0,0 +1,36 @@
+"""
+Dump the full catalog (products with sizes and categories) as NDJSON or CSV.
+
+    python -m app.productService.commands.export_products catalog.ndjson
+    python -m app.productService.commands.export_products catalog.csv.gz
+"""
+import argparse
+import asyncio
+
+from app.productService.services import export as export_service
+
+
+async def run(path: str, fmt: str, compress: bool) -> None:
+    written = 0
+    with open(path, "wb") as out:
+        async for chunk in export_service.export_catalog(fmt, compress):
+            await asyncio.to_thread(out.write, chunk)
+            written += len(chunk)
+    print(f"Wrote {written} bytes to {path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export the product catalog")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=list(export_service.EXPORT_MEDIA_TYPES), default=None)
+    parser.add_argument("--gzip", action="store_true", default=None, help="defaults to on for *.gz paths")
+    args = parser.parse_args()
+
+    base = args.path[:-3] if args.path.endswith(".gz") else args.path
+    fmt = args.format or ("csv" if base.endswith(".csv") else "ndjson")
+    compress = args.gzip if args.gzip is not None else args.path.endswith(".gz")
+    asyncio.run(run(args.path, fmt, compress))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Bulk-load products from an NDJSON or CSV file.
+
+    python -m app.productService.commands.import_products products.ndjson
+    python -m app.productService.commands.import_products products.csv --batch-size 5000
+"""
+import argparse
+import asyncio
+
+from app.databaseConfigs.database import SessionLocal
+from app.productService.services import bulk_import as bulk_import_service
+
+
+async def run(path: str, fmt: str, batch_size: int) -> None:
+    async with SessionLocal() as db:
+        with open(path, encoding="utf-8", newline="") as stream:
+            report = await bulk_import_service.import_products(db, stream, fmt, batch_size)
+
+    print(
+        f"Imported {report.imported}/{report.total_rows} rows "
+        f"({report.failed} failed) in {report.elapsed_seconds}s, {report.rows_per_second} rows/s"
+    )
+    for error in report.errors:
+        print(f"  row {error.row}: {error.error}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk import products from NDJSON or CSV")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default=None)
+    parser.add_argument("--batch-size", type=int, default=bulk_import_service.DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    fmt = args.format or bulk_import_service.detect_format(args.path)
+    asyncio.run(run(args.path, fmt, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Re-render every catalog_view row from products, categories and sizes. Run after the
+migration that creates catalog_view, after backfills that bypassed the services, and
+when ProductListing changes shape.
+
+    python -m app.productService.commands.rebuild_catalog_view
+    python -m app.productService.commands.rebuild_catalog_view --batch-size 2000
+"""
+import argparse
+import asyncio
+import time
+
+from app.databaseConfigs.database import SessionLocal, engine
+# Product's relationships need their models registered
+from app.databaseConfigs.models.productServiceModel.category import Category  # noqa: F401
+from app.databaseConfigs.models.productServiceModel.product_size import ProductSize  # noqa: F401
+from app.productService.services.catalog_version import bump_catalog_version
+from app.productService.services.catalog_view import DEFAULT_REBUILD_BATCH_SIZE, rebuild_catalog_view
+
+
+async def run(batch_size: int) -> None:
+    started = time.perf_counter()
+    try:
+        async with SessionLocal() as db:
+            rendered = await rebuild_catalog_view(db, batch_size)
+            # Bodies may have changed; move list ETags on
+            await bump_catalog_version(db)
+            await db.commit()
+    finally:
+        await engine.dispose()
+    print(f"Rebuilt catalog_view for {rendered} products in {time.perf_counter() - started:.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild the catalog_view read model")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_REBUILD_BATCH_SIZE)
+    args = parser.parse_args()
+    asyncio.run(run(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 
-from app.databaseConfigs.database import get_db
+from app.databaseConfigs.database import get_db, get_read_db
 from app.productService.schemas.category import CategoryCreate, CategoryResponse
 from app.productService.services import category as category_service
-from app.productService.schemas.product import ProductResponse
+from app.productService.schemas.product import ProductListing
+from app.productService.services.catalog_version import catalog_list_etag
+from app.utils.etag import etag_matches, not_modified, set_etag
+from app.utils.pagination import NEXT_CURSOR_HEADER, next_cursor
+from app.utils.serialization import join_json, json_response, render_list
 router = APIRouter(prefix="/categories", tags=["Categories"])
 
 
@@ -15,12 +19,19 @@ async def create_category(payload: CategoryCreate, db: AsyncSession = Depends(ge
 
 
 @router.get("/", response_model=List[CategoryResponse])
-async def get_categories(db: AsyncSession = Depends(get_db)):
-    return await category_service.list_categories(db)
+async def get_categories(request: Request, db: AsyncSession = Depends(get_read_db)):
+    etag = await catalog_list_etag(db, request)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    categories = await category_service.list_categories(db)
+    response = json_response(render_list(CategoryResponse, categories))
+    set_etag(response, etag)
+    return response
 
 
 @router.get("/{category_id}", response_model=CategoryResponse)
-async def get_category(category_id: str, db: AsyncSession = Depends(get_db)):
+async def get_category(category_id: str, db: AsyncSession = Depends(get_read_db)):
     return await category_service.get_category_by_id(db, category_id)
 
 
@@ -28,11 +39,17 @@ async def get_category(category_id: str, db: AsyncSession = Depends(get_db)):
 async def delete_category(category_id: str, db: AsyncSession = Depends(get_db)):
     await category_service.delete_category(db, category_id)
 
-@router.get("/{category_id}/products", response_model=List[ProductResponse])
+@router.get("/{category_id}/products", response_model=List[ProductListing])
 async def get_products_for_category(
     category_id: str,
     skip: int = 0,
     limit: int = 10,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
 ):
-    return await category_service.get_products_by_category(db, category_id, skip, limit)
\ No newline at end of file
+    rows = await category_service.get_products_by_category(db, category_id, skip, limit, cursor)
+    response = json_response(join_json(row.body for row in rows))
+    cursor_value = next_cursor(rows, limit, "created_at", "id")
+    if cursor_value:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_value
+    return response
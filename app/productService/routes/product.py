@@ -1,11 +1,33 @@
-from fastapi import APIRouter, Depends, Form, File, UploadFile
+from fastapi import APIRouter, Depends, Form, File, UploadFile, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import List, Optional, Union
+from decimal import Decimal
 from fastapi import HTTPException
-from app.databaseConfigs.database import get_db
-from app.productService.schemas.product import ProductUpdate, ProductResponse,ProductCreate
+from fastapi.responses import StreamingResponse
+from app.databaseConfigs.database import get_db, get_read_db
+from app.productService.schemas.product import (
+    ProductUpdate,
+    ProductResponse,
+    ProductListing,
+    ProductCreate,
+    ProductSummary,
+    ProductFilter,
+    ProductSort,
+    ProductPage,
+    ImportReport,
+)
 from app.productService.schemas.product_size import ProductSizeCreate
 from app.productService.services import product as product_service
+from app.productService.services import search as search_service
+from app.productService.services import bulk_import as bulk_import_service
+from app.productService.services import export as export_service
+from app.productService.services.catalog_version import catalog_list_etag
+from app.config import settings
+from app.utils.compression import negotiate_encoding, weak_etag
+from app.utils.etag import etag_matches, make_etag, not_modified, set_etag
+from app.utils.pagination import NEXT_CURSOR_HEADER, next_cursor
+from app.utils.serialization import join_json, json_response, render_list
+import io
 import json
 router = APIRouter(prefix="/products", tags=["Products"])
 
@@ -66,19 +88,164 @@ async def create_product_with_files(
         image_files=images,
     )
 
-@router.get("/", response_model=List[ProductResponse])
-async def list_products(skip: int = 0, limit: int = 10, db: AsyncSession = Depends(get_db)):
-    return await product_service.list_products(db, skip, limit)
+def product_filter_params(
+    gender: Optional[str] = None,
+    age_group: Optional[str] = None,
+    min_price: Optional[Decimal] = None,
+    max_price: Optional[Decimal] = None,
+    category_ids: Optional[str] = None,  # comma-separated
+    is_active: Optional[bool] = None,
+    in_stock_size: Optional[str] = None,
+) -> ProductFilter:
+    return ProductFilter(
+        gender=gender,
+        age_group=age_group,
+        min_price=min_price,
+        max_price=max_price,
+        category_ids=category_ids.split(",") if category_ids else None,
+        is_active=is_active,
+        in_stock_size=in_stock_size,
+    )
+
+
+@router.post("/import", response_model=ImportReport)
+async def import_products(
+    file: UploadFile = File(...),
+    format: Optional[str] = Form(None),  # "ndjson" or "csv"; guessed from the upload if omitted
+    batch_size: int = Form(bulk_import_service.DEFAULT_BATCH_SIZE),
+    db: AsyncSession = Depends(get_db),
+):
+    fmt = format or bulk_import_service.detect_format(file.filename, file.content_type)
+    if fmt not in ("ndjson", "csv"):
+        raise HTTPException(status_code=400, detail="Unsupported format. Use ndjson or csv.")
+
+    # The upload is already spooled to a temp file; rows are read from it batch by batch
+    stream = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    try:
+        return await bulk_import_service.import_products(db, stream, fmt, batch_size)
+    finally:
+        stream.detach()
+
+
+@router.get("/", response_model=Union[List[ProductListing], ProductPage])
+async def list_products(
+    request: Request,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    sort: ProductSort = ProductSort.created_at,
+    facets: bool = False,  # wrap the page with facet counts
+    filters: ProductFilter = Depends(product_filter_params),
+    db: AsyncSession = Depends(get_read_db),
+):
+    etag = await catalog_list_etag(db, request)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    rows = await product_service.list_products(db, skip, limit, cursor, filters, sort)
+    cursor_value = next_cursor(rows, limit, *product_service.product_sort_fields(sort))
+    items = join_json(row.body for row in rows)
+
+    if facets:
+        # ProductPage, spliced around the pre-rendered items
+        page_facets = await product_service.get_product_facets(db, filters)
+        response = json_response(
+            b'{"items":' + items
+            + b',"facets":' + page_facets.model_dump_json().encode()
+            + b',"next_cursor":' + json.dumps(cursor_value).encode() + b"}"
+        )
+    else:
+        response = json_response(items)
+
+    set_etag(response, etag)
+    if cursor_value:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_value
+    return response
+
+
+@router.get("/summary", response_model=List[ProductSummary])
+async def list_product_summaries(
+    request: Request,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    sort: ProductSort = ProductSort.created_at,
+    filters: ProductFilter = Depends(product_filter_params),
+    db: AsyncSession = Depends(get_read_db),
+):
+    etag = await catalog_list_etag(db, request)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    products = await product_service.list_product_summaries(db, skip, limit, cursor, filters, sort)
+    response = json_response(render_list(ProductSummary, products))
+    set_etag(response, etag)
+    cursor_value = next_cursor(products, limit, *product_service.product_sort_fields(sort))
+    if cursor_value:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_value
+    return response
+
+
+@router.get("/search", response_model=List[ProductListing])
+async def search_products(
+    q: str,
+    request: Request,
+    skip: int = 0,
+    limit: int = 20,
+    db: AsyncSession = Depends(get_read_db),
+):
+    etag = await catalog_list_etag(db, request)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    bodies = await search_service.search_products(db, q, skip, limit)
+    response = json_response(join_json(bodies))
+    set_etag(response, etag)
+    return response
+
+
+@router.get("/export")
+async def export_products(format: str = "ndjson", gzip: bool = False):
+    if format not in export_service.EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="Unsupported format. Use ndjson or csv.")
+
+    filename = f"catalog.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        export_service.export_catalog(format, compress=gzip),
+        media_type="application/gzip" if gzip else export_service.EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get("/{product_id}", response_model=ProductResponse)
-async def get_product(product_id: str, db: AsyncSession = Depends(get_db)):
-    return await product_service.get_product_by_id(db, product_id)
+async def get_product(product_id: str, request: Request, db: AsyncSession = Depends(get_read_db)):
+    body = await product_service.get_product_response(db, product_id)
+    # Content hash of the cached bytes: a cache hit answers 304 with no DB or serialization
+    etag = make_etag(body)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    if encoding and len(body) >= settings.COMPRESSION_MIN_SIZE:
+        # Compressed once per body version and cached; the middleware leaves it alone
+        content = await product_service.get_compressed_product_response(product_id, body, etag, encoding)
+        response = Response(
+            content=content,
+            media_type="application/json",
+            headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+        )
+        set_etag(response, weak_etag(etag))
+        return response
+
+    response = Response(content=body, media_type="application/json")
+    set_etag(response, etag)
+    return response
 
 
 @router.put("/{product_id}", response_model=ProductResponse)
 async def update_product_with_files(
     product_id: str,
+    request: Request,
     sku: Optional[int] = Form(None),
     name: Optional[str] = Form(None),
     price: Optional[float] = Form(None),
@@ -120,7 +287,7 @@ async def update_product_with_files(
         except Exception:
             raise HTTPException(status_code=400, detail="Invalid existing_images format. Should be JSON list.")
 
-    payload = ProductUpdate(
+    values = dict(
         sku=sku,
         name=name,
         price=price,
@@ -137,6 +304,13 @@ async def update_product_with_files(
         thumbnail=existing_thumbnail,
         images=existing_image_list,
     )
+    # Only fields present in the form are set, so omitted ones are left alone and an
+    # empty value clears a nullable one (the service applies exclude_unset)
+    form = await request.form()
+    form_names = {"thumbnail": "existing_thumbnail", "images": "existing_images"}
+    payload = ProductUpdate(**{
+        field: value for field, value in values.items() if form_names.get(field, field) in form
+    })
 
     return await product_service.update_product(
         db=db,
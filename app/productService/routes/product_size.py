@@ -1,21 +1,33 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 
-from app.databaseConfigs.database import get_db
+from app.databaseConfigs.database import get_db, get_read_db
 from app.productService.services import product_size as size_service
 from app.productService.schemas.product_size import ProductSizeResponse
+from app.utils.etag import etag_matches, make_etag, not_modified, set_etag
+from app.utils.pagination import NEXT_CURSOR_HEADER, next_cursor
+from app.utils.serialization import json_response, render_list
 
 router = APIRouter(prefix="/sizes", tags=["Product Sizes"])
 
 
 @router.get("/", response_model=List[ProductSizeResponse])
-async def get_sizes(db: AsyncSession = Depends(get_db)):
-    return await size_service.list_sizes(db)
+async def get_sizes(
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    sizes = await size_service.list_sizes(db, limit, cursor)
+    response = json_response(render_list(ProductSizeResponse, sizes))
+    cursor_value = next_cursor(sizes, limit, "id")
+    if cursor_value:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_value
+    return response
 
 
 @router.get("/{size_id}", response_model=ProductSizeResponse)
-async def get_size(size_id: str, db: AsyncSession = Depends(get_db)):
+async def get_size(size_id: str, db: AsyncSession = Depends(get_read_db)):
     return await size_service.get_size_by_id(db, size_id)
 
 
@@ -24,5 +36,18 @@ async def delete_size(size_id: str, db: AsyncSession = Depends(get_db)):
     await size_service.delete_size(db, size_id)
     
 @router.get("/product/{product_id}", response_model=List[ProductSizeResponse])
-async def get_sizes_for_product(product_id: str, db: AsyncSession = Depends(get_db)):
-    return await size_service.get_sizes_by_product_id(db, product_id)
\ No newline at end of file
+async def get_sizes_for_product(
+    product_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+):
+    sizes = await size_service.get_sizes_by_product_id(db, product_id)
+    body = render_list(ProductSizeResponse, sizes)
+    # Sizes carry stock, which reservations change without bumping the catalog
+    # version, so the tag hashes the body instead
+    etag = make_etag(body)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response = json_response(body)
+    set_etag(response, etag)
+    return response
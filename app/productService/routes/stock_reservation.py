@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.authService.auth.dependencies import get_current_user
+from app.databaseConfigs.database import get_db
+from app.databaseConfigs.models.authServiceModel.user import User
+from app.productService.schemas.stock_reservation import (
+    ReservationCreate,
+    ReservationRelease,
+    ReservationReleaseResult,
+    ReservationResponse,
+)
+from app.productService.services import stock_reservation as reservation_service
+
+router = APIRouter(prefix="/reservations", tags=["Stock Reservations"])
+
+
+@router.post("/", response_model=ReservationResponse, status_code=201)
+async def reserve_stock(
+    payload: ReservationCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await reservation_service.reserve_stock(db, payload.items, current_user.userid)
+
+
+@router.post("/release", response_model=ReservationReleaseResult)
+async def release_reservations(
+    payload: ReservationRelease,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    released = await reservation_service.release_reservations(db, payload.reservation_ids, current_user.userid)
+    return {"released": released}
+
+
+@router.post("/{reservation_id}/confirm", status_code=204)
+async def confirm_reservation(
+    reservation_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    await reservation_service.confirm_reservation(db, reservation_id, current_user.userid)
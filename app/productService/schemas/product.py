@@ -1,10 +1,11 @@
 from pydantic import BaseModel
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 from decimal import Decimal
 from datetime import datetime
+import enum
 
 from app.productService.schemas.category import CategoryResponse
-from app.productService.schemas.product_size import ProductSizeCreate, ProductSizeResponse
+from app.productService.schemas.product_size import ProductSizeCreate, ProductSizeListing, ProductSizeResponse
 
 
 # ----- BASE PRODUCT SCHEMA -----
@@ -36,27 +37,27 @@ class ProductCreate(ProductBase):
 
 # ----- UPDATE SCHEMA (JSON only) -----
 class ProductUpdate(BaseModel):
-    sku: Optional[int]
-    name: Optional[str]
-    description: Optional[str]
+    sku: Optional[int] = None
+    name: Optional[str] = None
+    description: Optional[str] = None
 
-    price: Optional[Decimal]
-    cost_price: Optional[Decimal]
-    discount: Optional[int]
-    max_discount: Optional[int]
+    price: Optional[Decimal] = None
+    cost_price: Optional[Decimal] = None
+    discount: Optional[int] = None
+    max_discount: Optional[int] = None
 
-    gender: Optional[str]
-    age_group: Optional[str]
+    gender: Optional[str] = None
+    age_group: Optional[str] = None
 
-    max_order_count: Optional[int]
-    is_active: Optional[bool]
+    max_order_count: Optional[int] = None
+    is_active: Optional[bool] = None
 
-    category_ids: Optional[List[str]]
-    sizes: Optional[List[ProductSizeCreate]]
+    category_ids: Optional[List[str]] = None
+    sizes: Optional[List[ProductSizeCreate]] = None
 
     # These are strings (URLs), not files
-    thumbnail: Optional[str]  # This should point to new URL if updated
-    images: Optional[List[str]]  # Append or replace from service layer
+    thumbnail: Optional[str] = None  # This should point to new URL if updated
+    images: Optional[List[str]] = None  # Append or replace from service layer
 
 
 # ----- RESPONSE SCHEMA -----
@@ -68,5 +69,93 @@ class ProductResponse(ProductBase):
     sizes: List[ProductSizeResponse]
     thumbnail: str
     images: Optional[List[str]]
+    # srcset-style map: original path -> {"320w": url, "640w": url, ...}
+    image_variants: Optional[Dict[str, Dict[str, str]]] = None
+    # Cheapest and dearest size after discount
+    min_effective_price: Optional[Decimal] = None
+    max_effective_price: Optional[Decimal] = None
+    class Config:
+        orm_mode = True
+
+
+# ----- LISTING SCHEMA (catalog lists and search) -----
+class ProductListing(ProductResponse):
+    # Listing bodies are stored in catalog_view and covered by the catalog ETag; stock is not
+    sizes: List[ProductSizeListing]
+
+
+# ----- SUMMARY SCHEMA (catalog grid) -----
+class ProductSummary(BaseModel):
+    id: str
+    name: str
+    thumbnail: str
+    price: Decimal
+    discount: Optional[int] = 0
+    max_discount: Optional[int] = 0
+    min_effective_price: Optional[Decimal] = None
+    max_effective_price: Optional[Decimal] = None
+
     class Config:
         orm_mode = True
+
+
+# ----- LISTING FILTERS / SORT -----
+class ProductSort(str, enum.Enum):
+    created_at = "created_at"  # oldest first, the default listing order
+    newest = "newest"
+    price_asc = "price_asc"
+    price_desc = "price_desc"
+    discount = "discount"  # highest discount first
+
+
+class ProductFilter(BaseModel):
+    gender: Optional[str] = None
+    age_group: Optional[str] = None
+    min_price: Optional[Decimal] = None
+    max_price: Optional[Decimal] = None
+    category_ids: Optional[List[str]] = None  # matches products in any of them
+    is_active: Optional[bool] = None
+    in_stock_size: Optional[str] = None  # e.g. "M": only products with stock in that size
+
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class ProductFacets(BaseModel):
+    gender: List[FacetCount]
+    age_group: List[FacetCount]
+    categories: List[FacetCount]
+    sizes: List[FacetCount]
+    min_price: Optional[Decimal] = None
+    max_price: Optional[Decimal] = None
+
+
+class ProductPage(BaseModel):
+    items: List[ProductListing]
+    facets: ProductFacets
+    next_cursor: Optional[str] = None
+
+
+# ----- BULK IMPORT -----
+class ProductImportRow(ProductCreate):
+    category_ids: List[str] = []  # ids or names
+    sizes: List[ProductSizeCreate] = []
+    # Already-hosted image URLs/paths; bulk rows carry no file uploads
+    thumbnail: str
+    images: List[str] = []
+
+
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    total_rows: int
+    imported: int
+    failed: int
+    errors: List[ImportRowError]
+    elapsed_seconds: float
+    rows_per_second: float
@@ -14,3 +14,16 @@ class ProductSizeResponse(ProductSizeBase):
 
     class Config:
         orm_mode = True
+
+
+class ProductSizeListing(BaseModel):
+    """
+    A size as embedded in catalog listings: without stock, which changes with every
+    reservation and is only shown on the product detail.
+    """
+    id: str
+    size: str
+    additional_price: Optional[float] = 0.0
+
+    class Config:
+        orm_mode = True
@@ -0,0 +1,37 @@
+from pydantic import BaseModel, Field
+from typing import List
+from datetime import datetime
+
+
+class ReservationItem(BaseModel):
+    size_id: str
+    quantity: int = Field(gt=0)
+
+
+class ReservationCreate(BaseModel):
+    items: List[ReservationItem] = Field(min_length=1)
+
+
+class ReservationItemResponse(BaseModel):
+    product_size_id: str
+    quantity: int
+
+    class Config:
+        orm_mode = True
+
+
+class ReservationResponse(BaseModel):
+    id: str
+    expires_at: datetime
+    items: List[ReservationItemResponse]
+
+    class Config:
+        orm_mode = True
+
+
+class ReservationRelease(BaseModel):
+    reservation_ids: List[str] = Field(min_length=1)
+
+
+class ReservationReleaseResult(BaseModel):
+    released: int
@@ -0,0 +1,248 @@
+import asyncio
+import csv
+import json
+import time
+from datetime import datetime
+from decimal import Decimal
+from itertools import islice
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+from uuid import uuid4
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.databaseConfigs.models.productServiceModel.category import Category
+from app.databaseConfigs.models.productServiceModel.product import Product, product_categories
+from app.databaseConfigs.models.productServiceModel.product_size import ProductSize
+from app.productService.schemas.product import ImportReport, ImportRowError, ProductImportRow
+from app.productService.services.catalog_version import bump_catalog_version
+from app.productService.services.pricing import refresh_effective_prices
+from app.productService.services.catalog_view import refresh_catalog_view
+from app.productService.services.uploads import adjust_blob_refs, product_blob_refs
+
+DEFAULT_BATCH_SIZE = 1000
+# Keep the report bounded for files that are wrong on every line
+MAX_REPORTED_ERRORS = 1000
+
+PRODUCT_COLUMNS = (
+    "id", "sku", "name", "thumbnail", "images", "description", "price", "cost_price",
+    "discount", "max_discount", "gender", "age_group", "max_order_count", "is_active",
+    "created_at", "updated_at",
+)
+SIZE_COLUMNS = ("id", "product_id", "size", "stock", "additional_price")
+LINK_COLUMNS = ("product_id", "category_id")
+
+# (row number, parsed fields or None, parse error or None)
+ParsedRow = Tuple[int, Optional[dict], Optional[str]]
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str] = None) -> str:
+    if (filename or "").lower().endswith(".csv") or (content_type or "").startswith("text/csv"):
+        return "csv"
+    return "ndjson"
+
+
+def iter_ndjson(stream: IO[str]) -> Iterator[ParsedRow]:
+    for number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            yield number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(data, dict):
+            yield number, None, "Row must be a JSON object"
+            continue
+        yield number, data, None
+
+
+def _split_list(value: str) -> List[str]:
+    if value.lstrip().startswith("["):
+        return json.loads(value)
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def iter_csv(stream: IO[str]) -> Iterator[ParsedRow]:
+    """
+    CSV rows use the ProductImportRow field names as headers. `sizes` is a JSON list;
+    `category_ids` and `images` are comma-separated or a JSON list.
+    """
+    reader = csv.DictReader(stream)
+    for number, record in enumerate(reader, start=1):
+        try:
+            data = {key: value for key, value in record.items() if key and value not in (None, "")}
+            if "sizes" in data:
+                data["sizes"] = json.loads(data["sizes"])
+            for field in ("category_ids", "images"):
+                if field in data:
+                    data[field] = _split_list(data[field])
+        except ValueError as e:
+            yield number, None, f"Invalid list field: {e}"
+            continue
+        yield number, data, None
+
+
+def _prepare_batch(
+    rows: Iterator[ParsedRow], batch_size: int, category_map: Dict[str, str]
+) -> Tuple[int, Dict[str, list], List[ImportRowError]]:
+    """
+    Parse, validate and flatten the next batch into insert-ready rows.
+    Runs in a worker thread so file reads and validation stay off the event loop.
+    """
+    now = datetime.utcnow()
+    records = {"products": [], "sizes": [], "links": []}
+    errors = []
+    count = 0
+
+    for number, data, parse_error in islice(rows, batch_size):
+        count += 1
+        if parse_error:
+            errors.append(ImportRowError(row=number, error=parse_error))
+            continue
+        try:
+            row = ProductImportRow(**data)
+        except ValidationError as e:
+            message = "; ".join(
+                f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors()
+            )
+            errors.append(ImportRowError(row=number, error=message))
+            continue
+
+        missing = [ref for ref in row.category_ids if ref not in category_map]
+        if missing:
+            errors.append(ImportRowError(row=number, error=f"Categories not found: {', '.join(missing)}"))
+            continue
+
+        product_id = str(uuid4())
+        records["products"].append({
+            "id": product_id,
+            **row.dict(exclude={"category_ids", "sizes"}),
+            "created_at": now,
+            "updated_at": now,
+        })
+        records["sizes"].extend(
+            {"id": str(uuid4()), "product_id": product_id, **size.dict()} for size in row.sizes
+        )
+        # A row may name the same category twice (by id and by name)
+        category_ids = dict.fromkeys(category_map[ref] for ref in row.category_ids)
+        records["links"].extend(
+            {"product_id": product_id, "category_id": category_id} for category_id in category_ids
+        )
+
+    return count, records, errors
+
+
+async def _copy_batch(db: AsyncSession, records: Dict[str, list]) -> None:
+    """
+    Postgres fast path: COPY the batch straight through the asyncpg connection.
+    """
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+    driver = raw.driver_connection
+
+    products = [
+        tuple(json.dumps(r[c]) if c == "images" else r[c] for c in PRODUCT_COLUMNS)
+        for r in records["products"]
+    ]
+    await driver.copy_records_to_table("products", records=products, columns=PRODUCT_COLUMNS)
+    if records["sizes"]:
+        # ProductSizeCreate carries additional_price as float; the numeric codec wants Decimal
+        sizes = [
+            tuple(Decimal(str(r[c])) if c == "additional_price" and r[c] is not None else r[c] for c in SIZE_COLUMNS)
+            for r in records["sizes"]
+        ]
+        await driver.copy_records_to_table("product_sizes", records=sizes, columns=SIZE_COLUMNS)
+    if records["links"]:
+        links = [tuple(r[c] for c in LINK_COLUMNS) for r in records["links"]]
+        await driver.copy_records_to_table("product_categories", records=links, columns=LINK_COLUMNS)
+
+
+async def _insert_batch(db: AsyncSession, records: Dict[str, list]) -> None:
+    if db.get_bind().dialect.name == "postgresql":
+        await _copy_batch(db, records)
+    else:
+        await db.execute(insert(Product.__table__), records["products"])
+        if records["sizes"]:
+            await db.execute(insert(ProductSize.__table__), records["sizes"])
+        if records["links"]:
+            await db.execute(insert(product_categories), records["links"])
+    # Rows may point at blobs already in the upload store
+    await adjust_blob_refs(db, added=[
+        path for r in records["products"] for path in product_blob_refs(r["thumbnail"], r["images"])
+    ])
+    product_ids = [r["id"] for r in records["products"]]
+    await refresh_effective_prices(db, product_ids)
+    await refresh_catalog_view(db, product_ids)
+    await bump_catalog_version(db)
+    await db.commit()
+
+
+async def load_category_map(db: AsyncSession) -> Dict[str, str]:
+    """
+    Every category reference a row may use (id or name) -> category id, loaded once per import.
+    """
+    result = await db.execute(select(Category.id, Category.name))
+    category_map = {}
+    for category_id, name in result.all():
+        category_map[name] = category_id
+        category_map[category_id] = category_id
+    return category_map
+
+
+async def import_products(
+    db: AsyncSession,
+    stream: IO[str],
+    fmt: str = "ndjson",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> ImportReport:
+    """
+    Stream rows from `stream` into products, product_sizes and product_categories,
+    committing one batch at a time. Invalid rows are skipped and reported; a batch
+    the database rejects is reported once, against its first row, and the import continues.
+    """
+    if fmt not in ("ndjson", "csv"):
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+    started = time.perf_counter()
+    rows = iter_csv(stream) if fmt == "csv" else iter_ndjson(stream)
+    category_map = await load_category_map(db)
+
+    total = imported = failed = 0
+    errors: List[ImportRowError] = []
+
+    while True:
+        count, records, batch_errors = await asyncio.to_thread(
+            _prepare_batch, rows, batch_size, category_map
+        )
+        if count == 0:
+            break
+        total += count
+        failed += len(batch_errors)
+        errors.extend(batch_errors[: MAX_REPORTED_ERRORS - len(errors)])
+
+        if not records["products"]:
+            continue
+        try:
+            await _insert_batch(db, records)
+            imported += len(records["products"])
+        except Exception as e:  # SQLAlchemy or raw asyncpg COPY errors
+            await db.rollback()
+            failed += len(records["products"])
+            first_row = total - count + 1
+            message = f"Batch of rows {first_row}-{total} rejected: {getattr(e, 'orig', e)}"
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append(ImportRowError(row=first_row, error=message))
+
+    elapsed = time.perf_counter() - started
+    return ImportReport(
+        total_rows=total,
+        imported=imported,
+        failed=failed,
+        errors=errors,
+        elapsed_seconds=round(elapsed, 3),
+        rows_per_second=round(imported / elapsed, 1) if elapsed > 0 else 0.0,
+    )
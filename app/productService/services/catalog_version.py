@@ -0,0 +1,79 @@
+import time
+from typing import Dict, Tuple
+
+from fastapi import Request
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.databaseConfigs.models.productServiceModel.catalog_version import (
+    CatalogVersion,
+    CATALOG_VERSION_ID,
+)
+from app.utils.etag import make_etag
+
+# Engine -> (version, monotonic time it was read); reset by local writes for
+# read-your-writes. Kept per engine so a lagging replica's value never answers
+# for the primary.
+_cached_versions: Dict[object, Tuple[int, float]] = {}
+# Bumped on each local reset so a read that raced a commit is not cached
+_generation = 0
+
+
+async def get_catalog_version(db: AsyncSession) -> int:
+    """
+    Current catalog version, re-read from the database at most once per
+    CATALOG_VERSION_TTL_SECONDS so conditional list requests usually skip the DB.
+    """
+    bind = db.get_bind()
+    now = time.monotonic()
+    cached = _cached_versions.get(bind)
+    if cached and now - cached[1] < settings.CATALOG_VERSION_TTL_SECONDS:
+        return cached[0]
+
+    generation = _generation
+    result = await db.execute(select(CatalogVersion.version).where(CatalogVersion.id == CATALOG_VERSION_ID))
+    version = result.scalar_one_or_none() or 0
+    if generation == _generation:
+        _cached_versions[bind] = (version, now)
+    return version
+
+
+async def bump_catalog_version(db: AsyncSession) -> None:
+    """
+    Increment the version inside the caller's transaction; commit is left to the caller.
+    """
+    await db.execute(
+        update(CatalogVersion)
+        .where(CatalogVersion.id == CATALOG_VERSION_ID)
+        .values(version=CatalogVersion.version + 1)
+    )
+    db.info["catalog_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _forget_version_after_commit(session: Session) -> None:
+    # Drop the cached version only once the bump is visible, so a read racing the
+    # write can't re-cache the old value for a whole TTL
+    global _generation
+    if session.info.pop("catalog_changed", False):
+        _cached_versions.clear()
+        _generation += 1
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_version_bump(session: Session) -> None:
+    session.info.pop("catalog_changed", None)
+
+
+async def catalog_list_etag(db: AsyncSession, request: Request) -> str:
+    """
+    Weak ETag for a catalog list. Each worker may serve a version up to
+    CATALOG_VERSION_TTL_SECONDS old, so for that long one tag can go out with
+    different bodies from different workers; a strong tag would promise they're
+    byte-identical.
+    """
+    version = await get_catalog_version(db)
+    return f'W/{make_etag("catalog", version, request.url.path, request.url.query)}'
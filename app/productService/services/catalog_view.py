@@ -0,0 +1,119 @@
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, exists
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+
+from app.databaseConfigs.models.productServiceModel.catalog_view import CatalogView
+from app.databaseConfigs.models.productServiceModel.product import Product
+from app.productService.schemas.product import ProductListing
+from app.utils.serialization import render
+
+# Product columns copied next to the body for filtering and sorting
+VIEW_COLUMNS = (
+    "name", "thumbnail", "price", "discount", "max_discount", "min_effective_price",
+    "max_effective_price", "gender", "age_group", "is_active", "created_at",
+)
+
+DEFAULT_REBUILD_BATCH_SIZE = 500
+
+
+class CatalogViewError(RuntimeError):
+    pass
+
+
+def _view_row(product: Product) -> dict:
+    row = {column: getattr(product, column) for column in VIEW_COLUMNS}
+    row["id"] = product.id
+    row["body"] = render(ProductListing, product).decode()
+    return row
+
+
+async def _upsert(db: AsyncSession, rows: list) -> None:
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(CatalogView).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CatalogView.id],
+            set_={column: stmt.excluded[column] for column in (*VIEW_COLUMNS, "body")},
+        )
+        await db.execute(stmt)
+    else:
+        for row in rows:
+            await db.merge(CatalogView(**row))
+
+
+async def refresh_catalog_view(db: AsyncSession, product_ids: Iterable[str]) -> None:
+    """
+    Re-render the catalog_view rows of `product_ids` from products, categories and
+    sizes, in the caller's transaction; rows of products that no longer exist are
+    removed. Every write path that changes what a product response shows calls this
+    before committing, after refresh_effective_prices.
+    """
+    product_ids = set(product_ids)
+    if not product_ids:
+        return
+
+    result = await db.execute(
+        select(Product)
+        .options(selectinload(Product.categories), selectinload(Product.sizes))
+        .where(Product.id.in_(product_ids))
+        # Objects in this session may hold values from before a bulk UPDATE
+        .execution_options(populate_existing=True)
+    )
+    products = result.scalars().all()
+
+    gone = product_ids - {product.id for product in products}
+    if gone:
+        await db.execute(delete(CatalogView).where(CatalogView.id.in_(gone)).execution_options(synchronize_session=False))
+    if products:
+        await _upsert(db, [_view_row(product) for product in products])
+
+
+async def rebuild_catalog_view(db: AsyncSession, batch_size: Optional[int] = None) -> int:
+    """
+    Re-render every product in id order, committing one batch at a time, then drop
+    rows whose product is gone. For backfills and after changes to ProductListing.
+    Returns the number of products rendered.
+    """
+    batch_size = batch_size or DEFAULT_REBUILD_BATCH_SIZE
+    rendered = 0
+    last_id = None
+    while True:
+        stmt = select(Product.id).order_by(Product.id).limit(batch_size)
+        if last_id is not None:
+            stmt = stmt.where(Product.id > last_id)
+        product_ids = (await db.execute(stmt)).scalars().all()
+        if not product_ids:
+            break
+        await refresh_catalog_view(db, product_ids)
+        await db.commit()
+        # Keep memory flat across batches
+        db.expunge_all()
+        rendered += len(product_ids)
+        last_id = product_ids[-1]
+
+    await db.execute(
+        delete(CatalogView)
+        .where(CatalogView.id.not_in(select(Product.id)))
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return rendered
+
+
+async def check_catalog_view(conn: AsyncConnection) -> None:
+    """
+    Startup check: refuse to start while some product has no catalog_view row, e.g.
+    right after the migration that creates the table. Listings and the product detail
+    read only from catalog_view, so they would be empty or 404 until it is rebuilt.
+    """
+    missing = await conn.execute(select(exists().where(Product.id.not_in(select(CatalogView.id)))))
+    if missing.scalar():
+        raise CatalogViewError(
+            "catalog_view is missing products. "
+            "Run `python -m app.productService.commands.rebuild_catalog_view` first."
+        )
@@ -1,16 +1,22 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
+from typing import Optional
 
 from app.databaseConfigs.models.productServiceModel.category import Category
-from app.databaseConfigs.models.productServiceModel.product import Product
+from app.databaseConfigs.models.productServiceModel.catalog_view import CatalogView
+from app.databaseConfigs.models.productServiceModel.product import product_categories
 from app.productService.schemas.category import CategoryCreate
+from app.productService.services.product_cache import product_cache
+from app.productService.services.catalog_version import bump_catalog_version
+from app.productService.services.catalog_view import refresh_catalog_view
+from app.utils.pagination import paginate_by_created_at
 
 
 async def create_category(db: AsyncSession, payload: CategoryCreate) -> Category:
     category = Category(**payload.dict())
     db.add(category)
+    await bump_catalog_version(db)
     await db.commit()
     await db.refresh(category)
     return category
@@ -35,26 +41,38 @@ async def list_categories(db: AsyncSession) -> list[Category]:
 
 async def delete_category(db: AsyncSession, category_id: str) -> None:
     category = await get_category_by_id(db, category_id)
+    # Product responses (cached and in catalog_view) embed their categories
+    result = await db.execute(
+        select(product_categories.c.product_id).where(product_categories.c.category_id == category_id)
+    )
+    product_ids = result.scalars().all()
+
     await db.delete(category)
+    await refresh_catalog_view(db, product_ids)
+    await bump_catalog_version(db)
     await db.commit()
+    await product_cache.invalidate(*product_ids)
 
 
 async def get_products_by_category(
-    db: AsyncSession, category_id: str, skip: int = 0, limit: int = 10
-) -> list[Product]:
+    db: AsyncSession,
+    category_id: str,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+):
+    """
+    Rendered product bodies in the category, from catalog_view. The link table's
+    category_id index drives the join.
+    """
     # Ensure category exists
     await get_category_by_id(db, category_id)
 
     stmt = (
-        select(Product)
-        .join(Product.categories)
-        .where(Category.id == category_id)
-        .options(
-            selectinload(Product.categories),
-            selectinload(Product.sizes)
-        )
-        .offset(skip)
-        .limit(limit)
+        select(CatalogView.body, CatalogView.created_at, CatalogView.id)
+        .join(product_categories, product_categories.c.product_id == CatalogView.id)
+        .where(product_categories.c.category_id == category_id)
     )
+    stmt = paginate_by_created_at(stmt, CatalogView, skip, limit, cursor)
     result = await db.execute(stmt)
-    return result.scalars().all()
+    return result.all()
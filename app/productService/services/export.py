@@ -0,0 +1,141 @@
+import csv
+import io
+import json
+import zlib
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import AsyncIterator, Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.databaseConfigs.database import SessionLocal
+from app.databaseConfigs.models.productServiceModel.category import Category
+from app.databaseConfigs.models.productServiceModel.product import Product, product_categories
+from app.databaseConfigs.models.productServiceModel.product_size import ProductSize
+
+# Rows fetched per server-side cursor round trip; also the unit for size/category lookups
+EXPORT_BATCH_SIZE = 500
+# Flush to the client (or compressor) once this much output is buffered
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+# cost_price is internal and stays out of feeds
+EXPORT_COLUMNS = (
+    "id", "sku", "name", "description", "thumbnail", "images", "price", "discount",
+    "max_discount", "gender", "age_group", "max_order_count", "is_active",
+    "created_at", "updated_at",
+)
+CSV_HEADER = EXPORT_COLUMNS + ("category_ids", "categories", "sizes")
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+async def iter_export_records(db: AsyncSession) -> AsyncIterator[dict]:
+    """
+    Yield every product with its sizes and categories. Products come through a
+    server-side cursor; sizes and categories are fetched per partition, so memory
+    stays bounded by EXPORT_BATCH_SIZE whatever the catalog size.
+    """
+    columns = [getattr(Product, name) for name in EXPORT_COLUMNS]
+    stmt = (
+        select(*columns)
+        .order_by(Product.created_at, Product.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    result = await db.stream(stmt)
+
+    async for partition in result.mappings().partitions():
+        product_ids = [row["id"] for row in partition]
+
+        sizes: Dict[str, List[dict]] = defaultdict(list)
+        size_rows = await db.execute(
+            select(ProductSize.product_id, ProductSize.size, ProductSize.stock, ProductSize.additional_price)
+            .where(ProductSize.product_id.in_(product_ids))
+            .order_by(ProductSize.product_id, ProductSize.size)
+        )
+        for product_id, size, stock, additional_price in size_rows.all():
+            sizes[product_id].append({"size": size, "stock": stock, "additional_price": additional_price})
+
+        categories: Dict[str, List[tuple]] = defaultdict(list)
+        category_rows = await db.execute(
+            select(product_categories.c.product_id, Category.id, Category.name)
+            .join(Category, Category.id == product_categories.c.category_id)
+            .where(product_categories.c.product_id.in_(product_ids))
+        )
+        for product_id, category_id, name in category_rows.all():
+            categories[product_id].append((category_id, name))
+
+        for row in partition:
+            record = dict(row)
+            linked = categories.get(row["id"], [])
+            record["category_ids"] = [category_id for category_id, _ in linked]
+            record["categories"] = [name for _, name in linked]
+            record["sizes"] = sizes.get(row["id"], [])
+            yield record
+
+
+def _csv_line(record: dict) -> str:
+    buffer = io.StringIO()
+    values = []
+    for column in CSV_HEADER:
+        value = record[column]
+        if column in ("images", "sizes"):
+            value = json.dumps(value or [], default=_json_default)
+        elif column in ("category_ids", "categories"):
+            value = ",".join(value)
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        values.append(value)
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue()
+
+
+async def export_catalog(fmt: str = "ndjson", compress: bool = False) -> AsyncIterator[bytes]:
+    """
+    Encoded (and optionally gzipped) export, yielded in ~EXPORT_CHUNK_BYTES chunks.
+    Opens its own session so it can outlive the request's dependencies while streaming.
+    """
+    if fmt not in EXPORT_MEDIA_TYPES:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    # wbits=31: gzip container, so the output is a valid .gz file
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    pending: List[str] = []
+    pending_size = 0
+
+    def flush() -> bytes:
+        nonlocal pending_size
+        data = "".join(pending).encode()
+        pending.clear()
+        pending_size = 0
+        return compressor.compress(data) if compressor else data
+
+    if fmt == "csv":
+        header = io.StringIO()
+        csv.writer(header).writerow(CSV_HEADER)
+        pending.append(header.getvalue())
+
+    async with SessionLocal() as db:
+        async for record in iter_export_records(db):
+            line = _csv_line(record) if fmt == "csv" else json.dumps(record, default=_json_default) + "\n"
+            pending.append(line)
+            pending_size += len(line)
+            if pending_size >= EXPORT_CHUNK_BYTES:
+                chunk = flush()
+                if chunk:
+                    yield chunk
+
+    chunk = flush()
+    if compressor:
+        chunk += compressor.flush()
+    if chunk:
+        yield chunk
@@ -0,0 +1,54 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from app.config import settings
+from app.utils.image_variants import render_variants
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: never fork a process that is running an event loop and DB pool
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_image_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def generate_variants(path: str) -> Dict[str, str]:
+    """
+    Resized WebP variants of one saved upload, rendered in the process pool.
+    Files Pillow can't decode simply get no variants.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(
+            _get_pool(),
+            render_variants,
+            path,
+            settings.IMAGE_VARIANT_WIDTHS,
+            settings.IMAGE_VARIANT_QUALITY,
+        )
+    except Exception as e:
+        print(f"Image variants failed for {path}: {e}")
+        return {}
+
+
+async def generate_variant_map(paths: List[str]) -> Dict[str, Dict[str, str]]:
+    """
+    {original path: {"<width>w": variant path}} for every path that produced variants.
+    """
+    results = await asyncio.gather(*(generate_variants(path) for path in paths))
+    return {path: variants for path, variants in zip(paths, results) if variants}
@@ -0,0 +1,57 @@
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from sqlalchemy import and_, case, func, update
+from sqlalchemy.future import select
+
+from app.databaseConfigs.models.productServiceModel.product import Product
+from app.databaseConfigs.models.productServiceModel.product_size import ProductSize
+
+# Decimal literal so SQLite divides as real numbers rather than integers
+HUNDRED = Decimal("100")
+
+
+def discount_percent():
+    """
+    Discount actually applied: `discount`, capped by `max_discount` when one is set.
+    """
+    return case(
+        (and_(Product.max_discount > 0, Product.discount > Product.max_discount), Product.max_discount),
+        else_=func.coalesce(Product.discount, 0),
+    )
+
+
+def effective_price(additional_price=None):
+    """
+    SQL expression for what a customer pays for a product (plus a size's surcharge).
+    """
+    base = Product.price if additional_price is None else Product.price + func.coalesce(additional_price, 0)
+    return func.round(base * (HUNDRED - discount_percent()) / HUNDRED, 2)
+
+
+def _size_price_rollup(aggregate):
+    # Correlated to the products row being updated; NULL when the product has no sizes
+    return (
+        select(aggregate(effective_price(ProductSize.additional_price)))
+        .where(ProductSize.product_id == Product.id)
+        .scalar_subquery()
+    )
+
+
+async def refresh_effective_prices(db, product_ids: Optional[Iterable[str]] = None) -> None:
+    """
+    Recompute products.min/max_effective_price from price, discount, max_discount and
+    the sizes' additional_price, in one set-based UPDATE inside the caller's
+    transaction. Call after any write to those columns; all products when `product_ids`
+    is None. `db` may be a session or a connection.
+    """
+    stmt = update(Product).values(
+        min_effective_price=func.coalesce(_size_price_rollup(func.min), effective_price()),
+        max_effective_price=func.coalesce(_size_price_rollup(func.max), effective_price()),
+    )
+    if product_ids is not None:
+        product_ids = list(product_ids)
+        if not product_ids:
+            return
+        stmt = stmt.where(Product.id.in_(product_ids))
+    await db.execute(stmt.execution_options(synchronize_session="fetch"))
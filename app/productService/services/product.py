@@ -2,22 +2,37 @@
 from sqlalchemy.future import select
 # from fastapi import HTTPException, status
 # from typing import List, Optional
-import os
-import uuid
 from fastapi import UploadFile, Form
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 # from sqlalchemy import select
+from sqlalchemy import distinct, exists, func
 from sqlalchemy.orm import selectinload
 from typing import List,Optional
+import json
 
-from app.databaseConfigs.models.productServiceModel.product import Product
+from app.databaseConfigs.models.productServiceModel.product import Product, product_categories
 from app.databaseConfigs.models.productServiceModel.category import Category
 from app.databaseConfigs.models.productServiceModel.product_size import ProductSize
+from app.databaseConfigs.models.productServiceModel.catalog_view import CatalogView
 from app.productService.schemas.product import (
     ProductCreate,
-    ProductUpdate
+    ProductResponse,
+    ProductUpdate,
+    ProductFilter,
+    ProductSort,
+    ProductFacets,
+    FacetCount,
 )
+from app.productService.services.product_cache import compressed_product_cache, product_cache
+from app.productService.services.catalog_version import bump_catalog_version
+from app.productService.services.pricing import refresh_effective_prices
+from app.productService.services.catalog_view import refresh_catalog_view
+from app.productService.services.uploads import adjust_blob_refs, product_blob_refs, save_files
+from app.productService.services.images import generate_variant_map
+from app.utils.compression import compress_async
+from app.utils.pagination import paginate
+from app.utils.serialization import render
 
 
 # async def create_product(db: AsyncSession, payload: ProductCreate) -> Product:
@@ -66,20 +81,6 @@ from app.productService.schemas.product import (
 #     product = result.scalar_one()
 #     return product
 
-UPLOAD_DIRECTORY = "app/static/uploads"  # Adjust based on your project
-
-async def save_file(file: UploadFile, subdir: str) -> str:
-    os.makedirs(os.path.join(UPLOAD_DIRECTORY, subdir), exist_ok=True)
-    file_extension = os.path.splitext(file.filename)[1]
-    unique_name = f"{uuid.uuid4()}{file_extension}"
-    file_path = os.path.join(UPLOAD_DIRECTORY, subdir, unique_name)
-    
-    with open(file_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
-    return file_path
-
-
 async def create_product_with_files(
     db: AsyncSession,
     payload: ProductCreate,
@@ -93,16 +94,7 @@ async def create_product_with_files(
     if not image_files or len(image_files) == 0:
         raise HTTPException(status_code=400, detail="At least one image is required")
 
-    # Save thumbnail
-    thumbnail_path = await save_file(thumbnail_file, "thumbnails")
-
-    # Save images
-    image_paths = []
-    for file in image_files:
-        path = await save_file(file, "images")
-        image_paths.append(path)
-
-    # Fetch categories
+    # Fetch categories before touching disk so a bad request writes nothing
     stmt = select(Category).where(Category.id.in_(payload.category_ids))
     result = await db.execute(stmt)
     categories = result.scalars().all()
@@ -110,12 +102,18 @@ async def create_product_with_files(
     if len(categories) != len(payload.category_ids):
         raise HTTPException(status_code=404, detail="One or more categories not found")
 
+    # Save thumbnail and images concurrently
+    saved = await save_files([thumbnail_file, *image_files])
+    thumbnail_path, image_paths = saved[0], saved[1:]
+    image_variants = await generate_variant_map(saved)
+
     # Create product
     product = Product(
         sku=payload.sku,
         name=payload.name,
         thumbnail=thumbnail_path,
         images=image_paths,
+        image_variants=image_variants,
         description=payload.description,
         price=payload.price,
         cost_price=payload.cost_price,
@@ -132,6 +130,11 @@ async def create_product_with_files(
         product.sizes.append(ProductSize(**size.dict()))
 
     db.add(product)
+    await db.flush()
+    await refresh_effective_prices(db, [product.id])
+    await refresh_catalog_view(db, [product.id])
+    await adjust_blob_refs(db, added=product_blob_refs(thumbnail_path, image_paths))
+    await bump_catalog_version(db)
     await db.commit()
 
     # Fetch with relationships
@@ -166,18 +169,198 @@ async def get_product_by_id(db: AsyncSession, product_id: str) -> Product:
     return product
 
 
-async def list_products(db: AsyncSession, skip: int = 0, limit: int = 10) -> List[Product]:
-    stmt = (
-        select(Product)
-        .options(
-            selectinload(Product.categories),
-            selectinload(Product.sizes),
+async def get_product_response(db: AsyncSession, product_id: str) -> bytes:
+    """
+    Serialized ProductResponse for the detail view, read through the product cache:
+    the catalog_view listing body with each size's current stock filled in.
+    """
+    async def load() -> bytes:
+        result = await db.execute(select(CatalogView.body).where(CatalogView.id == product_id))
+        body = result.scalar_one_or_none()
+        if body is None:
+            raise HTTPException(status_code=404, detail="Product not found")
+        result = await db.execute(select(ProductSize.id, ProductSize.stock).where(ProductSize.product_id == product_id))
+        stock = dict(result.all())
+        document = json.loads(body)
+        for size in document["sizes"]:
+            size["stock"] = stock.get(size["id"], 0)
+        return render(ProductResponse, document)
+
+    return await product_cache.get_or_load(product_id, load)
+
+
+async def get_compressed_product_response(product_id: str, body: bytes, etag: str, encoding: str) -> bytes:
+    """
+    `body` compressed for `encoding`, cached in compressed_product_cache. Keyed by the
+    body's ETag, so a compressed entry can never be served for a different version of
+    the body.
+    """
+    key = f"{product_id}:{encoding}:{etag}"
+    return await compressed_product_cache.get_or_load(key, lambda: compress_async(body, encoding))
+
+
+# Sort option -> (sort keys ending in the unique id, descending)
+SORT_KEYS = {
+    ProductSort.created_at: (("created_at", "id"), False),
+    ProductSort.newest: (("created_at", "id"), True),
+    ProductSort.price_asc: (("min_effective_price", "id"), False),
+    ProductSort.price_desc: (("min_effective_price", "id"), True),
+    ProductSort.discount: (("sort_discount", "id"), True),
+}
+
+# Sort key -> what pages are ordered and sought on. Discount is nullable, and NULLs
+# neither match a keyset seek nor sort the same way on every database, so a missing
+# discount sorts (and goes into the cursor) as 0.
+SORT_COLUMNS = {
+    "created_at": CatalogView.created_at,
+    "min_effective_price": CatalogView.min_effective_price,
+    "sort_discount": func.coalesce(CatalogView.discount, 0),
+    "id": CatalogView.id,
+}
+
+
+def product_sort_fields(sort: ProductSort) -> tuple:
+    return SORT_KEYS[sort][0]
+
+
+def _sort_key_columns(sort: ProductSort, *selected) -> list:
+    # Sort keys to select next to `selected` so next_cursor finds them on each row
+    names = {column.key for column in selected}
+    return [SORT_COLUMNS[field].label(field) for field in SORT_KEYS[sort][0] if field not in names]
+
+
+def apply_product_filters(stmt, filters: Optional[ProductFilter], exclude: Optional[str] = None):
+    """
+    Add WHERE clauses for `filters` to a statement selecting from catalog_view.
+    `exclude` skips one facet's own filter so its counts show the alternatives.
+    """
+    if filters is None:
+        return stmt
+    if filters.gender is not None and exclude != "gender":
+        stmt = stmt.where(CatalogView.gender == filters.gender)
+    if filters.age_group is not None and exclude != "age_group":
+        stmt = stmt.where(CatalogView.age_group == filters.age_group)
+    if exclude != "price":
+        # Against the lowest price actually payable, so ranges match the sort order
+        if filters.min_price is not None:
+            stmt = stmt.where(CatalogView.min_effective_price >= filters.min_price)
+        if filters.max_price is not None:
+            stmt = stmt.where(CatalogView.min_effective_price <= filters.max_price)
+    if filters.is_active is not None:
+        stmt = stmt.where(CatalogView.is_active == filters.is_active)
+    if filters.category_ids and exclude != "categories":
+        stmt = stmt.where(
+            CatalogView.id.in_(
+                select(product_categories.c.product_id)
+                .where(product_categories.c.category_id.in_(filters.category_ids))
+            )
+        )
+    if filters.in_stock_size and exclude != "sizes":
+        stmt = stmt.where(
+            exists().where(
+                ProductSize.product_id == CatalogView.id,
+                ProductSize.size == filters.in_stock_size,
+                ProductSize.stock > 0,
+            )
         )
-        .offset(skip)
-        .limit(limit)
+    return stmt
+
+
+def _sorted_page(stmt, sort: ProductSort, skip: int, limit: int, cursor: Optional[str]):
+    fields, descending = SORT_KEYS[sort]
+    columns = [SORT_COLUMNS[field] for field in fields]
+    return paginate(stmt, columns, skip, limit, cursor, descending)
+
+
+async def list_products(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    filters: Optional[ProductFilter] = None,
+    sort: ProductSort = ProductSort.created_at,
+):
+    """
+    A page of rendered ProductListing bodies from catalog_view, with the sort key
+    columns alongside for the next cursor. One indexed query, nothing to join or load.
+    """
+    stmt = select(CatalogView.body, *_sort_key_columns(sort))
+    stmt = apply_product_filters(stmt, filters)
+    stmt = _sorted_page(stmt, sort, skip, limit, cursor)
+    result = await db.execute(stmt)
+    return result.all()
+
+
+async def list_product_summaries(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    filters: Optional[ProductFilter] = None,
+    sort: ProductSort = ProductSort.created_at,
+):
+    """
+    Column-only listing for catalog grids, straight off catalog_view columns.
+    created_at is selected only to build the next cursor.
+    """
+    columns = (
+        CatalogView.id,
+        CatalogView.name,
+        CatalogView.thumbnail,
+        CatalogView.price,
+        CatalogView.discount,
+        CatalogView.max_discount,
+        CatalogView.min_effective_price,
+        CatalogView.max_effective_price,
+        CatalogView.created_at,
     )
+    stmt = select(*columns, *_sort_key_columns(sort, *columns))
+    stmt = apply_product_filters(stmt, filters)
+    stmt = _sorted_page(stmt, sort, skip, limit, cursor)
     result = await db.execute(stmt)
-    return result.scalars().all()
+    return result.all()
+
+
+async def get_product_facets(db: AsyncSession, filters: Optional[ProductFilter]) -> ProductFacets:
+    """
+    Per-attribute product counts for the current filters. Each facet ignores its
+    own filter, so selecting "Male" still shows how many "Female" products exist.
+    """
+    async def value_counts(column, exclude: str, stmt=None) -> List[FacetCount]:
+        stmt = stmt if stmt is not None else select(column, func.count(CatalogView.id))
+        stmt = apply_product_filters(stmt.where(column.is_not(None)), filters, exclude).group_by(column)
+        result = await db.execute(stmt.order_by(column))
+        return [FacetCount(value=value, count=count) for value, count in result.all()]
+
+    gender = await value_counts(CatalogView.gender, "gender")
+    age_group = await value_counts(CatalogView.age_group, "age_group")
+    categories = await value_counts(
+        product_categories.c.category_id,
+        "categories",
+        select(product_categories.c.category_id, func.count(CatalogView.id))
+        .join(CatalogView, CatalogView.id == product_categories.c.product_id),
+    )
+    sizes = await value_counts(
+        ProductSize.size,
+        "sizes",
+        select(ProductSize.size, func.count(distinct(ProductSize.product_id)))
+        .join(CatalogView, CatalogView.id == ProductSize.product_id)
+        .where(ProductSize.stock > 0),
+    )
+
+    price_stmt = apply_product_filters(
+        select(func.min(CatalogView.min_effective_price), func.max(CatalogView.min_effective_price)), filters, "price"
+    )
+    min_price, max_price = (await db.execute(price_stmt)).one()
+
+    return ProductFacets(
+        gender=gender,
+        age_group=age_group,
+        categories=categories,
+        sizes=sizes,
+        min_price=min_price,
+        max_price=max_price,
+    )
 
 
 # async def update_product(
@@ -266,6 +449,7 @@ async def update_product(
     new_image_files: Optional[List[UploadFile]] = None
 ) -> Product:
     product = await get_product_by_id(db, product_id)
+    refs_before = product_blob_refs(product.thumbnail, product.images)
 
     # Update scalar fields
     for field, value in payload.dict(exclude_unset=True).items():
@@ -280,29 +464,41 @@ async def update_product(
         elif field == "sizes" and value is not None:
             product.sizes.clear()
             for size_data in value:
-                product.sizes.append(ProductSize(**size_data.dict()))
+                product.sizes.append(ProductSize(**size_data))
 
         elif field not in ["thumbnail", "images"]:
             setattr(product, field, value)
 
-    # Ensure images is list before touching
-    if product.images is None:
-        product.images = []
+    # Work on a copy: in-place changes to a JSON column are not detected on commit
+    images = list(product.images or [])
+
+    # Save new thumbnail and images concurrently
+    uploads = list(new_image_files or [])
+    if new_thumbnail_file:
+        uploads.insert(0, new_thumbnail_file)
+    saved = await save_files(uploads) if uploads else []
+    if saved:
+        product.image_variants = {**(product.image_variants or {}), **await generate_variant_map(saved)}
 
     # Append new thumbnail
     if new_thumbnail_file:
-        thumb_path = await save_file(new_thumbnail_file, "thumbnails")
+        thumb_path = saved.pop(0)
         if product.thumbnail:
-            product.images.append(thumb_path)
+            images.append(thumb_path)
         else:
             product.thumbnail = thumb_path
 
     # Append new images
-    if new_image_files:
-        img_paths = [await save_file(img, "images") for img in new_image_files]
-        product.images.extend(img_paths)
-
+    images.extend(saved)
+    product.images = images
+
+    refs_after = product_blob_refs(product.thumbnail, product.images)
+    await adjust_blob_refs(db, added=refs_after - refs_before, removed=refs_before - refs_after)
+    await refresh_effective_prices(db, [product.id])
+    await refresh_catalog_view(db, [product.id])
+    await bump_catalog_version(db)
     await db.commit()
+    await product_cache.invalidate(product_id)
 
     stmt = (
         select(Product)
@@ -317,5 +513,9 @@ async def update_product(
 
 async def delete_product(db: AsyncSession, product_id: str) -> None:
     product = await get_product_by_id(db, product_id)
+    await adjust_blob_refs(db, removed=product_blob_refs(product.thumbnail, product.images))
     await db.delete(product)
+    await refresh_catalog_view(db, [product_id])
+    await bump_catalog_version(db)
     await db.commit()
+    await product_cache.invalidate(product_id)
@@ -0,0 +1,25 @@
+from app.config import settings
+from app.utils.cache import LRUCache, LocalSharedCache, ReadThroughCache
+
+# Serialized ProductResponse bytes keyed by product id
+product_cache = ReadThroughCache(
+    "product",
+    LRUCache(
+        max_entries=settings.PRODUCT_CACHE_MAX_ENTRIES,
+        ttl=settings.PRODUCT_CACHE_TTL_SECONDS,
+    ),
+    shared=LocalSharedCache() if settings.PRODUCT_CACHE_SHARED else None,
+    # Detail reads may come from a replica that hasn't seen the write yet
+    settle_seconds=settings.READ_YOUR_WRITES_SECONDS if settings.DATABASE_REPLICA_URLS else 0,
+)
+
+# Compressed detail bodies keyed by product id, encoding and the body's ETag. Writes
+# can't invalidate these (they don't know the ETag), so they get their own LRU:
+# superseded entries age out here instead of evicting live bodies above.
+compressed_product_cache = ReadThroughCache(
+    "product_compressed",
+    LRUCache(
+        max_entries=settings.PRODUCT_COMPRESSED_CACHE_MAX_ENTRIES,
+        ttl=settings.PRODUCT_CACHE_TTL_SECONDS,
+    ),
+)
@@ -1,9 +1,15 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from fastapi import HTTPException
+from typing import Optional
 
 from app.databaseConfigs.models.productServiceModel.product_size import ProductSize
 from app.productService.schemas.product_size import ProductSizeCreate
+from app.productService.services.product_cache import product_cache
+from app.productService.services.catalog_version import bump_catalog_version
+from app.productService.services.pricing import refresh_effective_prices
+from app.productService.services.catalog_view import refresh_catalog_view
+from app.utils.pagination import paginate
 
 
 async def get_size_by_id(db: AsyncSession, size_id: str) -> ProductSize:
@@ -15,15 +21,21 @@ async def get_size_by_id(db: AsyncSession, size_id: str) -> ProductSize:
     return size
 
 
-async def list_sizes(db: AsyncSession):
-    result = await db.execute(select(ProductSize))
+async def list_sizes(db: AsyncSession, limit: Optional[int] = None, cursor: Optional[str] = None):
+    # Sizes carry no created_at; the primary key alone gives a stable keyset order
+    stmt = paginate(select(ProductSize), (ProductSize.id,), 0, limit, cursor)
+    result = await db.execute(stmt)
     return result.scalars().all()
 
 
 async def delete_size(db: AsyncSession, size_id: str):
     size = await get_size_by_id(db, size_id)
     await db.delete(size)
+    await refresh_effective_prices(db, [size.product_id])
+    await refresh_catalog_view(db, [size.product_id])
+    await bump_catalog_version(db)
     await db.commit()
+    await product_cache.invalidate(size.product_id)
     
 async def get_sizes_by_product_id(db: AsyncSession, product_id: str):
     stmt = select(ProductSize).where(ProductSize.product_id == product_id)
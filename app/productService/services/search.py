@@ -0,0 +1,59 @@
+import re
+from typing import List
+
+from sqlalchemy import column, func, literal_column, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.databaseConfigs.models.productServiceModel.catalog_view import CatalogView
+from app.databaseConfigs.models.productServiceModel.product import Product
+
+# Unmapped FTS5 table maintained by triggers (see models.productServiceModel.product)
+products_fts = table("products_fts", column("rowid"))
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+# Cap the number of terms so a pasted paragraph can't build a huge query
+MAX_SEARCH_TERMS = 8
+
+
+def _search_terms(q: str) -> List[str]:
+    return _TOKEN_RE.findall(q.lower())[:MAX_SEARCH_TERMS]
+
+
+async def search_products(db: AsyncSession, q: str, skip: int = 0, limit: int = 20) -> List[str]:
+    """
+    Rank products by relevance of `q` against name (weighted higher) and description.
+    Every term is matched as a prefix so results show up while the user is typing.
+    Ranking runs on products' search index; the rendered bodies come from catalog_view.
+    """
+    terms = _search_terms(q)
+    if not terms:
+        return []
+
+    stmt = select(CatalogView.body).select_from(Product).join(CatalogView, CatalogView.id == Product.id)
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        query = func.to_tsquery("english", " & ".join(f"{term}:*" for term in terms))
+        vector = literal_column("products.search_vector")
+        stmt = (
+            stmt.where(vector.op("@@")(query))
+            .order_by(func.ts_rank_cd(vector, query).desc(), Product.id)
+        )
+    elif dialect == "sqlite":
+        match = " ".join(f'"{term}"*' for term in terms)
+        stmt = (
+            stmt.join(products_fts, products_fts.c.rowid == literal_column("products.rowid"))
+            .where(text("products_fts MATCH :match").bindparams(match=match))
+            # bm25 is lower-is-better; name weighted 10x description
+            .order_by(text("bm25(products_fts, 10.0, 1.0)"), Product.id)
+        )
+    else:
+        # No full-text support: plain substring match, unranked
+        for term in terms:
+            pattern = f"%{term}%"
+            stmt = stmt.where(Product.name.ilike(pattern) | Product.description.ilike(pattern))
+        stmt = stmt.order_by(Product.name, Product.id)
+
+    result = await db.execute(stmt.offset(skip).limit(limit))
+    return result.scalars().all()
@@ -0,0 +1,287 @@
+import asyncio
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+
+from fastapi import HTTPException
+from sqlalchemy import case, delete, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.config import settings
+from app.databaseConfigs.database import SessionLocal
+from app.databaseConfigs.models.authServiceModel.user import User
+from app.databaseConfigs.models.productServiceModel.product import Product
+from app.databaseConfigs.models.productServiceModel.product_size import ProductSize
+from app.databaseConfigs.models.productServiceModel.stock_reservation import (
+    StockReservation,
+    StockReservationItem,
+)
+from app.productService.schemas.stock_reservation import ReservationItem
+from app.productService.services.catalog_version import bump_catalog_version
+from app.productService.services.product_cache import product_cache
+
+# Bulk statements below bypass the identity map; nothing in the session mirrors these rows
+_NO_SYNC = {"synchronize_session": False}
+
+
+def _merge_quantities(items: Iterable[ReservationItem]) -> Dict[str, int]:
+    quantities: Counter = Counter()
+    for item in items:
+        quantities[item.size_id] += item.quantity
+    return dict(quantities)
+
+
+async def _held_by_user(db: AsyncSession, user_id: int, product_ids: Set[str]) -> Counter:
+    """
+    Units of each product the user already holds in unexpired reservations. The user's
+    row is locked first, so two reservations by one user are checked one after the
+    other rather than both against the same holdings.
+    """
+    await db.execute(select(User.userid).where(User.userid == user_id).with_for_update())
+    result = await db.execute(
+        select(ProductSize.product_id, func.sum(StockReservationItem.quantity))
+        .join(StockReservation, StockReservation.id == StockReservationItem.reservation_id)
+        .join(ProductSize, ProductSize.id == StockReservationItem.product_size_id)
+        .where(
+            StockReservation.user_id == user_id,
+            StockReservation.expires_at > datetime.utcnow(),
+            ProductSize.product_id.in_(product_ids),
+        )
+        .group_by(ProductSize.product_id)
+    )
+    return Counter(dict(result.all()))
+
+
+async def _check_order_limits(db: AsyncSession, quantities: Dict[str, int], user_id: Optional[int] = None) -> Set[str]:
+    """
+    Validate sizes against their products (exists, active, max_order_count) and return
+    the product ids involved. max_order_count also counts what the user already holds in
+    other reservations. Limits don't change under contention, so a plain read is enough.
+    """
+    result = await db.execute(
+        select(ProductSize.id, Product.id, Product.is_active, Product.max_order_count)
+        .join(Product, Product.id == ProductSize.product_id)
+        .where(ProductSize.id.in_(quantities))
+    )
+    rows = result.all()
+    missing = set(quantities) - {size_id for size_id, *_ in rows}
+    if missing:
+        raise HTTPException(status_code=404, detail={"error": "Product size not found", "size_ids": sorted(missing)})
+
+    per_product: Counter = Counter()
+    limits = {}
+    for size_id, product_id, is_active, max_order_count in rows:
+        if is_active is False:
+            raise HTTPException(status_code=400, detail=f"Product {product_id} is not available")
+        per_product[product_id] += quantities[size_id]
+        limits[product_id] = max_order_count
+
+    if user_id is not None:
+        per_product.update(await _held_by_user(db, user_id, set(per_product)))
+
+    for product_id, quantity in per_product.items():
+        limit = limits[product_id]
+        if limit is not None and quantity > limit:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {limit} units of product {product_id} can be reserved at once",
+            )
+    return set(per_product)
+
+
+async def reserve_stock(
+    db: AsyncSession,
+    items: List[ReservationItem],
+    user_id: Optional[int] = None,
+) -> StockReservation:
+    """
+    Hold stock for every requested size, all or nothing.
+
+    All sizes are decremented by one conditional statement,
+        UPDATE product_sizes SET stock = stock - <qty per id>
+        WHERE id IN (...) AND stock >= <qty per id> RETURNING id
+    so the stock check and the decrement happen under the same row lock: concurrent
+    buyers queue on the row and each re-checks the committed stock, and the count can
+    never go negative. If any size comes back short the whole transaction rolls back.
+
+    Listings filter and facet on stock > 0, so a size selling out bumps the catalog
+    version in the same transaction and list ETags stay tied to their bodies.
+    """
+    quantities = _merge_quantities(items)
+    product_ids = await _check_order_limits(db, quantities, user_id)
+
+    quantity = case(quantities, value=ProductSize.id)
+    result = await db.execute(
+        update(ProductSize)
+        .where(ProductSize.id.in_(quantities), ProductSize.stock >= quantity)
+        .values(stock=ProductSize.stock - quantity)
+        .returning(ProductSize.id, ProductSize.stock)
+        .execution_options(**_NO_SYNC)
+    )
+    remaining = dict(result.all())
+    reserved = set(remaining)
+    if len(reserved) != len(quantities):
+        await db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail={"error": "Insufficient stock", "size_ids": sorted(set(quantities) - reserved)},
+        )
+
+    reservation = StockReservation(
+        user_id=user_id,
+        expires_at=datetime.utcnow() + timedelta(seconds=settings.STOCK_RESERVATION_TTL_SECONDS),
+        items=[
+            StockReservationItem(product_size_id=size_id, quantity=qty)
+            for size_id, qty in quantities.items()
+        ],
+    )
+    if 0 in remaining.values():
+        await bump_catalog_version(db)
+    db.add(reservation)
+    await db.commit()
+    # Stock is only shown on the product detail; catalog_view bodies leave it out
+    await product_cache.invalidate(*product_ids)
+    return reservation
+
+
+async def _release(db: AsyncSession, *criteria) -> Set[str]:
+    """
+    Return the stock of the reservations matching `criteria` and delete them, in the
+    caller's transaction. The items are claimed by DELETE ... RETURNING, so when a user
+    release, a confirm and the sweeper race on one reservation only one of them gets
+    its rows and the stock is returned at most once. A size coming back into stock
+    bumps the catalog version, as selling out does in reserve_stock.
+    """
+    matching = select(StockReservation.id).where(*criteria)
+    result = await db.execute(
+        delete(StockReservationItem)
+        .where(StockReservationItem.reservation_id.in_(matching))
+        .returning(
+            StockReservationItem.reservation_id,
+            StockReservationItem.product_size_id,
+            StockReservationItem.quantity,
+        )
+        .execution_options(**_NO_SYNC)
+    )
+    rows = result.all()
+
+    if rows:
+        quantities: Counter = Counter()
+        for _, size_id, quantity in rows:
+            quantities[size_id] += quantity
+        restored = case(dict(quantities), value=ProductSize.id)
+        result = await db.execute(
+            update(ProductSize)
+            .where(ProductSize.id.in_(quantities))
+            .values(stock=ProductSize.stock + restored)
+            .returning(ProductSize.id, ProductSize.product_id, ProductSize.stock)
+            .execution_options(**_NO_SYNC)
+        )
+        product_ids = set()
+        back_in_stock = False
+        for size_id, product_id, stock in result.all():
+            product_ids.add(product_id)
+            back_in_stock = back_in_stock or stock == quantities[size_id]
+        if back_in_stock:
+            await bump_catalog_version(db)
+        db.info.setdefault("released_product_ids", set()).update(product_ids)
+
+    # Delete the reservations even when no items came back: deleting a size cascades
+    # to its items, and a reservation left without any would be swept again forever
+    result = await db.execute(
+        delete(StockReservation)
+        .where(*criteria)
+        .returning(StockReservation.id)
+        .execution_options(**_NO_SYNC)
+    )
+    return set(result.scalars().all())
+
+
+async def _invalidate_released(db: AsyncSession) -> None:
+    product_ids = db.info.pop("released_product_ids", None)
+    if product_ids:
+        await product_cache.invalidate(*product_ids)
+
+
+async def release_reservations(db: AsyncSession, reservation_ids: List[str], user_id: Optional[int] = None) -> int:
+    """
+    Release several reservations at once with set-based statements. Only the caller's
+    own reservations are touched when `user_id` is given; returns how many were released.
+    """
+    criteria = [StockReservation.id.in_(set(reservation_ids))]
+    if user_id is not None:
+        criteria.append(StockReservation.user_id == user_id)
+    released = await _release(db, *criteria)
+    await db.commit()
+    await _invalidate_released(db)
+    return len(released)
+
+
+async def confirm_reservation(db: AsyncSession, reservation_id: str, user_id: Optional[int] = None) -> None:
+    """
+    Turn a reservation into a sale: its items are dropped and the stock stays taken.
+    """
+    criteria = [StockReservation.id == reservation_id, StockReservation.expires_at > datetime.utcnow()]
+    if user_id is not None:
+        criteria.append(StockReservation.user_id == user_id)
+    result = await db.execute(
+        delete(StockReservationItem)
+        .where(StockReservationItem.reservation_id.in_(select(StockReservation.id).where(*criteria)))
+        .returning(StockReservationItem.reservation_id)
+        .execution_options(**_NO_SYNC)
+    )
+    if not result.first():
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="Reservation not found or expired")
+    await db.execute(
+        delete(StockReservation).where(StockReservation.id == reservation_id).execution_options(**_NO_SYNC)
+    )
+    await db.commit()
+
+
+async def expire_reservations(batch_size: Optional[int] = None) -> int:
+    """
+    Release reservations past expires_at, `batch_size` per transaction, oldest first.
+    Returns the number released.
+    """
+    batch_size = batch_size or settings.STOCK_RESERVATION_SWEEP_BATCH_SIZE
+    expired_total = 0
+    while True:
+        async with SessionLocal() as db:
+            result = await db.execute(
+                select(StockReservation.id)
+                .where(StockReservation.expires_at <= datetime.utcnow())
+                .order_by(StockReservation.expires_at)
+                .limit(batch_size)
+            )
+            candidates = result.scalars().all()
+            if not candidates:
+                break
+            # Re-check expiry: a candidate may have been confirmed meanwhile
+            released = await _release(
+                db,
+                StockReservation.id.in_(candidates),
+                StockReservation.expires_at <= datetime.utcnow(),
+            )
+            await db.commit()
+            await _invalidate_released(db)
+
+        expired_total += len(released)
+        if len(candidates) < batch_size:
+            break
+    return expired_total
+
+
+async def run_reservation_sweeper() -> None:
+    """
+    Background loop started from the app lifespan.
+    """
+    while True:
+        try:
+            expired = await expire_reservations()
+            if expired:
+                print(f"Reservation sweeper released {expired} expired reservations")
+        except Exception as e:
+            print(f"Reservation sweeper failed: {e}")
+        await asyncio.sleep(settings.STOCK_RESERVATION_SWEEP_INTERVAL_SECONDS)
@@ -0,0 +1,257 @@
+import asyncio
+import glob
+import hashlib
+import os
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import BinaryIO, Iterable, List, Optional, Set, Tuple
+
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import delete, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.config import settings
+from app.databaseConfigs.database import SessionLocal
+from app.databaseConfigs.models.productServiceModel.upload_blob import UploadBlob
+
+UPLOAD_DIRECTORY = "app/static/uploads"  # Adjust based on your project
+# Content-addressed store: blobs/<first two hex chars>/<sha256><ext>
+BLOB_DIRECTORY = os.path.join(UPLOAD_DIRECTORY, "blobs")
+# Uploads land here while they are hashed, then move into the store
+TMP_DIRECTORY = os.path.join(UPLOAD_DIRECTORY, "tmp")
+
+
+def blob_path(digest: str, extension: str) -> str:
+    return os.path.join(BLOB_DIRECTORY, digest[:2], f"{digest}{extension}")
+
+
+def _stream_to_disk(source: BinaryIO, file_path: str, max_bytes: int, chunk_size: int) -> Tuple[int, str]:
+    """
+    Copy `source` to `file_path` in bounded chunks, hashing as it goes and giving up
+    once it passes `max_bytes`. Returns (size, sha256 hex digest).
+    Blocking; callers run it in a worker thread.
+    """
+    digest = hashlib.sha256()
+    written = 0
+    try:
+        with open(file_path, "wb") as out:
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large. Maximum size is {max_bytes} bytes.",
+                    )
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+    return written, digest.hexdigest()
+
+
+def _place_blob(tmp_path: str, path: str) -> None:
+    """
+    Move a hashed upload into the store, or drop it if identical content is already there.
+    """
+    if os.path.exists(path):
+        os.remove(tmp_path)
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(tmp_path, path)
+
+
+async def _register_blob(path: str, digest: str, size: int) -> None:
+    """
+    Record the blob (or refresh an existing row) in its own committed transaction,
+    before the file is placed. A fresh updated_at keeps the GC off it while the
+    request that uploaded it is still running, and if the GC is deleting the same
+    row right now this waits for it, so the file is then written again.
+    """
+    now = datetime.utcnow()
+    values = {"path": path, "sha256": digest, "size": size, "ref_count": 0, "updated_at": now}
+    async with SessionLocal() as db:
+        dialect = db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            stmt = insert(UploadBlob).values(**values).on_conflict_do_update(
+                index_elements=[UploadBlob.path], set_={"updated_at": now}
+            )
+            await db.execute(stmt)
+        else:
+            blob = await db.get(UploadBlob, path)
+            if blob:
+                blob.updated_at = now
+            else:
+                db.add(UploadBlob(**values))
+        await db.commit()
+
+
+async def save_file(file: UploadFile) -> str:
+    """
+    Store an upload under the SHA-256 of its content and return its path. Identical
+    content uploaded again resolves to the same path and is kept on disk once.
+    """
+    os.makedirs(TMP_DIRECTORY, exist_ok=True)
+    file_extension = os.path.splitext(file.filename or "")[1].lower()
+    tmp_path = os.path.join(TMP_DIRECTORY, f"{uuid.uuid4()}{file_extension}")
+
+    size, digest = await asyncio.to_thread(
+        _stream_to_disk,
+        file.file,
+        tmp_path,
+        settings.MAX_UPLOAD_SIZE_BYTES,
+        settings.UPLOAD_CHUNK_SIZE_BYTES,
+    )
+    path = blob_path(digest, file_extension)
+    try:
+        await _register_blob(path, digest, size)
+        await asyncio.to_thread(_place_blob, tmp_path, path)
+    except BaseException:
+        await remove_files([tmp_path])
+        raise
+    return path
+
+
+async def save_files(files: List[UploadFile]) -> List[str]:
+    """
+    Save uploads concurrently, returning paths in the same order. Blobs may be shared
+    with other products, so a failed request leaves the ones already stored to the GC
+    rather than deleting them.
+    """
+    results = await asyncio.gather(*(save_file(file) for file in files), return_exceptions=True)
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        raise errors[0]
+    return results
+
+
+async def remove_files(paths: List[str]) -> None:
+    def remove() -> None:
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    if paths:
+        await asyncio.to_thread(remove)
+
+
+# ----- REFERENCE COUNTING -----
+
+def product_blob_refs(thumbnail: Optional[str], images: Optional[Iterable[str]]) -> Set[str]:
+    """
+    The distinct upload paths one product holds a reference on.
+    """
+    return {path for path in [thumbnail, *(images or [])] if path}
+
+
+async def adjust_blob_refs(
+    db: AsyncSession,
+    added: Iterable[str] = (),
+    removed: Iterable[str] = (),
+) -> None:
+    """
+    Move ref counts by one per occurrence in `added` / `removed`, inside the caller's
+    transaction so counts commit together with the product change. Paths that are
+    not in the store (e.g. imported URLs) are ignored.
+    """
+    deltas = Counter(added)
+    deltas.subtract(removed)
+
+    paths_by_delta = defaultdict(list)
+    for path, delta in deltas.items():
+        if delta:
+            paths_by_delta[delta].append(path)
+
+    now = datetime.utcnow()
+    for delta, paths in paths_by_delta.items():
+        await db.execute(
+            update(UploadBlob)
+            .where(UploadBlob.path.in_(paths))
+            .values(ref_count=UploadBlob.ref_count + delta, updated_at=now)
+        )
+
+
+# ----- GARBAGE COLLECTION -----
+
+def _remove_blob_files(paths: List[str]) -> None:
+    for path in paths:
+        base, _ = os.path.splitext(path)
+        # The blob plus whatever WebP variants were rendered from it
+        for file_path in [path, *glob.glob(f"{glob.escape(base)}_*w.webp")]:
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+
+
+def _remove_stale_tmp_files(older_than: float) -> int:
+    removed = 0
+    for entry in os.scandir(TMP_DIRECTORY) if os.path.isdir(TMP_DIRECTORY) else []:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < older_than:
+                os.remove(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+async def collect_unreferenced_blobs(
+    batch_size: Optional[int] = None,
+    grace_seconds: Optional[int] = None,
+) -> int:
+    """
+    Delete blobs nobody has referenced for `grace_seconds`, `batch_size` rows per
+    transaction. Files are removed before the row deletion commits, so an upload of
+    the same content arriving meanwhile waits on the row and writes the file back.
+    Returns the number of blobs removed.
+    """
+    batch_size = batch_size or settings.UPLOAD_GC_BATCH_SIZE
+    grace_seconds = settings.UPLOAD_GC_GRACE_SECONDS if grace_seconds is None else grace_seconds
+    cutoff = datetime.utcnow() - timedelta(seconds=grace_seconds)
+    unreferenced = (UploadBlob.ref_count <= 0, UploadBlob.updated_at < cutoff)
+
+    removed = 0
+    while True:
+        async with SessionLocal() as db:
+            candidates = select(UploadBlob.path).where(*unreferenced).limit(batch_size)
+            result = await db.execute(
+                delete(UploadBlob)
+                .where(UploadBlob.path.in_(candidates), *unreferenced)
+                .returning(UploadBlob.path)
+            )
+            paths = result.scalars().all()
+            await asyncio.to_thread(_remove_blob_files, paths)
+            await db.commit()
+
+        removed += len(paths)
+        if len(paths) < batch_size:
+            break
+
+    await asyncio.to_thread(_remove_stale_tmp_files, time.time() - grace_seconds)
+    return removed
+
+
+async def run_upload_gc() -> None:
+    """
+    Background loop started from the app lifespan.
+    """
+    while True:
+        try:
+            removed = await collect_unreferenced_blobs()
+            if removed:
+                print(f"Upload GC removed {removed} unreferenced blobs")
+        except Exception as e:
+            print(f"Upload GC failed: {e}")
+        await asyncio.sleep(settings.UPLOAD_GC_INTERVAL_SECONDS)
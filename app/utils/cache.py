@@ -0,0 +1,185 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+
+class CacheBackend(ABC):
+    """
+    Minimal async byte cache interface. A shared store (e.g. Redis) only needs
+    to implement these three calls to sit behind ReadThroughCache.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        ...
+
+
+class LRUCache(CacheBackend):
+    """
+    In-process LRU bounded by entry count, with a per-entry TTL.
+    """
+
+    def __init__(self, max_entries: int, ttl: int):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        self._entries[key] = (time.monotonic() + (ttl or self.ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class LocalSharedCache(CacheBackend):
+    """
+    Stand-in for a shared cache service, for local runs and single-worker deploys.
+    Unlike LRUCache it is unbounded and only drops entries once they expire.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[float, bytes]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+
+class ReadThroughCache:
+    """
+    Local LRU in front of an optional shared backend, in front of a loader.
+
+    Invalidation only reaches this worker's LRU and the shared backend, so other
+    workers may serve an entry until its TTL runs out; keep the TTL short.
+
+    When loaders may read from a lagging replica, `settle_seconds` keeps a key from
+    being re-cached that soon after its invalidation; loads still succeed, they are
+    just not stored until the replicas have caught up.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        local: LRUCache,
+        shared: Optional[CacheBackend] = None,
+        settle_seconds: float = 0,
+    ):
+        self.namespace = namespace
+        self.local = local
+        self.shared = shared
+        self.settle_seconds = settle_seconds
+        # Bumped on every invalidation so a load that raced a write is not stored
+        self._generation = 0
+        # key -> monotonic time of its last invalidation, while within settle_seconds
+        self._invalidated_at: Dict[str, float] = {}
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        full_key = self._key(key)
+        value = await self.local.get(full_key)
+        if value is None and self.shared is not None:
+            value = await self.shared.get(full_key)
+            if value is not None:
+                await self.local.set(full_key, value)
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        full_key = self._key(key)
+        await self.local.set(full_key, value)
+        if self.shared is not None:
+            await self.shared.set(full_key, value, self.local.ttl)
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[bytes]]) -> bytes:
+        value = await self.get(key)
+        if value is not None:
+            return value
+
+        generation = self._generation
+        value = await loader()
+        if generation == self._generation and not self._settling(key):
+            await self.set(key, value)
+        return value
+
+    def _settling(self, key: str) -> bool:
+        invalidated_at = self._invalidated_at.get(key)
+        if invalidated_at is None:
+            return False
+        if time.monotonic() - invalidated_at < self.settle_seconds:
+            return True
+        del self._invalidated_at[key]
+        return False
+
+    async def invalidate(self, *keys: str) -> None:
+        self._generation += 1
+        if self.settle_seconds:
+            now = time.monotonic()
+            # Drop settled keys so the map stays as small as the recent write set
+            self._invalidated_at = {
+                k: t for k, t in self._invalidated_at.items() if now - t < self.settle_seconds
+            }
+            self._invalidated_at.update((key, now) for key in keys)
+        full_keys = [self._key(key) for key in keys]
+        await self.local.delete(*full_keys)
+        if self.shared is not None:
+            await self.shared.delete(*full_keys)
+
+    def stats(self) -> Dict[str, int]:
+        return self.local.stats()
@@ -0,0 +1,192 @@
+import asyncio
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Only these are worth compressing; images, archives and fonts already are
+COMPRESSIBLE_MEDIA_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/csv",
+    "text/css",
+    "text/html",
+    "text/plain",
+)
+
+# Bodies above this are compressed in a worker thread instead of on the event loop
+THREAD_MINIMUM_SIZE = 128 * 1024
+
+
+def supported_encodings() -> tuple:
+    # Server preference when the client weighs several equally
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Best supported content-coding the client accepts (by q-value), or None for identity.
+    """
+    weights = {}
+    for item in (accept_encoding or "").split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        name, _, value = params.partition("=")
+        if name.strip() == "q":
+            try:
+                q = float(value)
+            except ValueError:
+                continue
+        weights[coding] = q
+
+    best, best_q = None, 0.0
+    for encoding in supported_encodings():
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    media_type = (content_type or "").partition(";")[0].strip().lower()
+    return media_type in COMPRESSIBLE_MEDIA_TYPES
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    # wbits=31: gzip container
+    compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress(body) + compressor.flush()
+
+
+async def compress_async(body: bytes, encoding: str) -> bytes:
+    if len(body) >= THREAD_MINIMUM_SIZE:
+        return await asyncio.to_thread(compress, body, encoding)
+    return compress(body, encoding)
+
+
+def weak_etag(etag: str) -> str:
+    # A compressed body is a different representation, so it can't keep a strong ETag
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+class _StreamEncoder:
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+            self._compress = self._compressor.process
+        else:
+            self._compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+            self._compress = self._compressor.compress
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compress(data)
+
+    def finish(self) -> bytes:
+        if hasattr(self._compressor, "finish"):
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+class CompressionMiddleware:
+    """
+    gzip/brotli for compressible responses of at least `minimum_size` bytes.
+
+    Responses that already carry a Content-Encoding (precompressed cache entries,
+    gzipped exports, precompressed static files), partial content and non-allowlisted
+    types pass through untouched. Streaming responses are compressed as they stream.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        start: Optional[Message] = None
+        encoder: Optional[_StreamEncoder] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, encoder, passthrough
+            message_type = message["type"]
+
+            if message_type == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if (
+                    "content-encoding" in headers
+                    or message["status"] in (204, 206, 304)
+                    or not is_compressible(headers.get("content-type"))
+                ):
+                    passthrough = True
+                    await send(message)
+                    return
+                # Identity and compressed bodies now differ per Accept-Encoding
+                MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+                if encoding is None:
+                    passthrough = True
+                    await send(message)
+                    return
+                # Hold the headers until the first body chunk shows whether to compress
+                start = message
+                return
+
+            if passthrough or message_type != "http.response.body":
+                if start is not None:
+                    await send(start)
+                    start = None
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start is not None:
+                headers = MutableHeaders(raw=start["headers"])
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    start = None
+                    return
+
+                headers["Content-Encoding"] = encoding
+                if "etag" in headers:
+                    headers["ETag"] = weak_etag(headers["etag"])
+                if more_body:
+                    del headers["Content-Length"]
+                    encoder = _StreamEncoder(encoding)
+                    body = encoder.compress(body)
+                else:
+                    body = await compress_async(body, encoding)
+                    headers["Content-Length"] = str(len(body))
+                await send(start)
+                start = None
+                await send({**message, "body": body})
+                return
+
+            body = encoder.compress(body)
+            if not more_body:
+                body += encoder.finish()
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_wrapper)
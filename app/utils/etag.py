@@ -0,0 +1,40 @@
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response
+
+# Clients and CDNs may store catalog responses but must revalidate them
+CACHE_CONTROL_REVALIDATE = "no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Strong ETag over the given parts (bytes are hashed as-is, anything else via str()).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\x00")
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so ignore any W/ prefix on either side
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL_REVALIDATE
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
@@ -0,0 +1,45 @@
+import os
+from typing import Dict, Iterable
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional; without it originals are served as-is
+    Image = None
+
+
+def variant_path(source_path: str, width: int) -> str:
+    base, _ = os.path.splitext(source_path)
+    return f"{base}_{width}w.webp"
+
+
+def render_variants(source_path: str, widths: Iterable[int], quality: int) -> Dict[str, str]:
+    """
+    Write a WebP copy of `source_path` at each width narrower than the original,
+    next to it on disk. Returns {"<width>w": path}, srcset descriptors as keys.
+    Sources are content-addressed, so variants already on disk are reused as-is.
+
+    CPU-bound and self-contained so it can run in a separate process.
+    """
+    if Image is None:
+        return {}
+
+    variants = {}
+    with Image.open(source_path) as original:
+        # Honour camera rotation before resizing, then drop the EXIF with it
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+        for width in sorted(set(widths)):
+            if width >= image.width:
+                continue
+            path = variant_path(source_path, width)
+            if not os.path.exists(path):
+                height = max(1, round(image.height * width / image.width))
+                resized = image.resize((width, height), Image.LANCZOS)
+                # Write then rename so a concurrent render never exposes a partial file
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                resized.save(tmp_path, "WEBP", quality=quality, method=4)
+                os.replace(tmp_path, path)
+            variants[f"{width}w"] = path
+    return variants
@@ -0,0 +1,98 @@
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+# Response header carrying the opaque cursor for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort key of the last row of a page into an opaque, URL-safe cursor.
+    """
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def decode_sort_cursor(cursor: str, columns: Sequence[Any]) -> List[Any]:
+    """
+    Decode a cursor and coerce each value back to the Python type of its sort column.
+    """
+    values = decode_cursor(cursor, len(columns))
+    try:
+        decoded = []
+        for column, value in zip(columns, values):
+            python_type = column.type.python_type
+            if python_type is datetime:
+                decoded.append(datetime.fromisoformat(value))
+            elif python_type is Decimal:
+                decoded.append(Decimal(value))
+            else:
+                decoded.append(python_type(value))
+        return decoded
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def next_cursor(rows: Sequence[Any], limit: Optional[int], *key_fields: str) -> Optional[str]:
+    """
+    Build the cursor for the page after `rows`, or None when this was the last page.
+    """
+    if not limit or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(*(getattr(last, field) for field in key_fields))
+
+
+def paginate(
+    stmt,
+    columns: Sequence[Any],
+    skip: int,
+    limit: Optional[int],
+    cursor: Optional[str],
+    descending: bool = False,
+):
+    """
+    Order `stmt` on `columns` (which must end in a unique column) and page it,
+    seeking past the cursor when one is given so deep pages cost the same as the
+    first one, else falling back to offset.
+    """
+    stmt = stmt.order_by(*(column.desc() if descending else column for column in columns))
+    if cursor:
+        values = decode_sort_cursor(cursor, columns)
+        key = tuple_(*columns)
+        stmt = stmt.where(key < tuple_(*values) if descending else key > tuple_(*values))
+    elif skip:
+        stmt = stmt.offset(skip)
+    if limit:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def paginate_by_created_at(stmt, model, skip: int, limit: Optional[int], cursor: Optional[str]):
+    return paginate(stmt, (model.created_at, model.id), skip, limit, cursor)
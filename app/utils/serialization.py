@@ -0,0 +1,42 @@
+from functools import lru_cache
+from typing import Any, Iterable, List, Type, Union
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def render(model: Type[BaseModel], obj: Any) -> bytes:
+    """
+    Validate one ORM object (or row) against `model` and serialize it straight to JSON bytes.
+    """
+    instance = model.model_validate(obj, from_attributes=True)
+    return model.__pydantic_serializer__.to_json(instance)
+
+
+def render_list(model: Type[BaseModel], objects: Iterable[Any]) -> bytes:
+    """
+    Validate a page of ORM objects against `model` in a single pass and serialize the
+    whole list to JSON bytes. Both steps run in pydantic-core, so there is no
+    intermediate dict and Decimal/datetime are encoded natively (as str / ISO 8601,
+    matching the response_model output).
+    """
+    adapter = _list_adapter(model)
+    return adapter.dump_json(adapter.validate_python(list(objects), from_attributes=True))
+
+
+def json_response(body: bytes) -> Response:
+    # Pre-rendered bytes: FastAPI skips response_model validation and encoding
+    return Response(content=body, media_type="application/json")
+
+
+def join_json(documents: Iterable[Union[str, bytes]]) -> bytes:
+    """
+    JSON array of documents that are already serialized (e.g. catalog_view bodies),
+    spliced together without parsing them again.
+    """
+    return b"[" + b",".join(d.encode() if isinstance(d, str) else d for d in documents) + b"]"
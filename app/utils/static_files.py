@@ -0,0 +1,145 @@
+import asyncio
+import errno
+import os
+import re
+import stat
+from mimetypes import guess_type
+from typing import Iterable, List, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.config import settings
+from app.utils.etag import make_etag
+
+# Upload URLs never change content: a new file gets a new name
+CACHE_CONTROL_IMMUTABLE = "public, max-age=31536000, immutable"
+
+# Precompressed siblings (<file>.br / <file>.gz) are only looked for on these types;
+# images are already compressed
+COMPRESSIBLE_TYPES = ("text/", "image/svg+xml", "application/json", "application/javascript", "application/xml")
+PRECOMPRESSED_EXTENSIONS = {"br": ".br", "gzip": ".gz"}
+
+# Blobs and their variants are named <sha256>[_<width>w]
+CONTENT_HASH_NAME = re.compile(r"[0-9a-f]{64}(_\d+w)?")
+
+# (relative path to try, content-encoding it carries)
+Candidate = Tuple[str, Optional[str]]
+
+
+def _accepted_encodings(request_headers: Headers) -> List[str]:
+    accepted = set()
+    for item in request_headers.get("accept-encoding", "").split(","):
+        coding, _, params = item.partition(";")
+        name, _, q = params.partition("=")
+        try:
+            if name.strip() == "q" and float(q) == 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(coding.strip().lower())
+    return [encoding for encoding in PRECOMPRESSED_EXTENSIONS if encoding in accepted]
+
+
+def _is_compressible(path: str) -> bool:
+    media_type = guess_type(path)[0] or ""
+    return media_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def _requested_width(scope: Scope) -> Optional[int]:
+    for item in scope.get("query_string", b"").decode("latin-1").split("&"):
+        name, _, value = item.partition("=")
+        if name == "w" and value.isdigit():
+            return int(value)
+    return None
+
+
+class UploadStaticFiles(StaticFiles):
+    """
+    StaticFiles for /static/uploads. On top of the stock behaviour (conditional
+    requests, byte ranges, pathsend when the server offers it) it:
+
+    * marks every response immutable with a strong, content-derived ETag;
+    * serves `?w=<px>` from the smallest rendered WebP variant at least that wide;
+    * serves <file>.br / <file>.gz when present and accepted;
+    * optionally hands the transfer to a fronting nginx (X-Accel-Redirect) so the
+      bytes go out via sendfile instead of through the worker.
+    """
+
+    def _candidates(self, path: str, scope: Scope, request_headers: Headers) -> List[Candidate]:
+        targets = [path]
+        width = _requested_width(scope)
+        if width:
+            base, _ = os.path.splitext(path)
+            wider = sorted(w for w in settings.IMAGE_VARIANT_WIDTHS if w >= width)
+            targets = [f"{base}_{w}w.webp" for w in wider] + targets
+
+        candidates: List[Candidate] = []
+        for target in targets:
+            if _is_compressible(target):
+                for encoding in _accepted_encodings(request_headers):
+                    candidates.append((target + PRECOMPRESSED_EXTENSIONS[encoding], encoding))
+            candidates.append((target, None))
+        return candidates
+
+    def _lookup_first(
+        self, candidates: Iterable[Candidate]
+    ) -> Optional[Tuple[str, os.stat_result, str, Optional[str]]]:
+        for relative_path, encoding in candidates:
+            full_path, stat_result = self.lookup_path(relative_path)
+            if stat_result and stat.S_ISREG(stat_result.st_mode):
+                return full_path, stat_result, relative_path, encoding
+        return None
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD"):
+            raise HTTPException(status_code=405, headers={"Allow": "GET, HEAD"})
+        # In-flight uploads are not content yet
+        if path.split(os.sep)[0] == "tmp":
+            raise HTTPException(status_code=404)
+
+        request_headers = Headers(scope=scope)
+        candidates = self._candidates(path, scope, request_headers)
+        try:
+            found = await asyncio.to_thread(self._lookup_first, candidates)
+        except PermissionError:
+            raise HTTPException(status_code=401)
+        except OSError as exc:
+            if exc.errno == errno.ENAMETOOLONG:
+                raise HTTPException(status_code=404)
+            raise
+        except ValueError:
+            raise HTTPException(status_code=404)
+
+        if found is None:
+            raise HTTPException(status_code=404)
+
+        full_path, stat_result, relative_path, encoding = found
+        served_path = relative_path[: -len(PRECOMPRESSED_EXTENSIONS[encoding])] if encoding else relative_path
+
+        name, _ = os.path.splitext(os.path.basename(served_path))
+        if CONTENT_HASH_NAME.fullmatch(name):
+            etag = f'"{name}-{encoding}"' if encoding else f'"{name}"'
+        else:
+            # Pre-hash uploads: still uniquely named, so size and mtime identify the content
+            etag = make_etag(relative_path, stat_result.st_size, stat_result.st_mtime_ns)
+
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL_IMMUTABLE}
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        if _is_compressible(served_path):
+            headers["Vary"] = "Accept-Encoding"
+        media_type = guess_type(served_path)[0] or "application/octet-stream"
+
+        if settings.STATIC_ACCEL_REDIRECT_PREFIX:
+            accel_path = "/".join([settings.STATIC_ACCEL_REDIRECT_PREFIX.rstrip("/"), *relative_path.split(os.sep)])
+            response = Response(media_type=media_type, headers={**headers, "X-Accel-Redirect": accel_path})
+        else:
+            response = FileResponse(full_path, stat_result=stat_result, media_type=media_type, headers=headers)
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,52 @@
+from typing import Iterable
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class UploadLimitMiddleware:
+    """
+    Caps multipart request bodies before Starlette spools them to temp files. A
+    Content-Length over `max_bytes` is answered 413 without reading the body; chunked
+    or understated bodies are cut off in receive as soon as they pass the limit.
+    Paths in `exempt_paths` (bulk import) are not limited.
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int, exempt_paths: Iterable[str] = ()):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.exempt_paths = frozenset(exempt_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if not headers.get("content-type", "").startswith("multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"Request too large. Maximum size is {self.max_bytes} bytes."
+        try:
+            declared = int(headers.get("content-length", ""))
+        except ValueError:
+            declared = None
+        if declared is not None and declared > self.max_bytes:
+            await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Raised inside the form parser, which lets HTTPException through
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,52 @@
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+# Settings are read at import time, so the environment has to be in place first
+_db_path = os.path.join(tempfile.mkdtemp(prefix="shop-tests-"), "test.db")
+# Always the throwaway database: every test starts by deleting it
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_path}"
+for key, value in {
+    "ENVIRONMENT": "test",
+    "JWT_SECRET_KEY": "test-secret",
+    "JWT_REFRESH_SECRET_KEY": "test-refresh-secret",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "REFRESH_TOKEN_EXPIRE_MINUTES": "60",
+    "INTERNAL_API_URL": "http://localhost",
+    "INTERNAL_SECRET_TOKEN": "test-internal",
+    "ALGORITHM": "HS256",
+    "OTP_EXPIRE_TIME": "5",
+}.items():
+    os.environ.setdefault(key, value)
+
+from sqlalchemy import event  # noqa: E402
+
+from app.databaseConfigs.database import engine  # noqa: E402
+from app.databaseConfigs.migrations import upgrade  # noqa: E402
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    if engine.dialect.name == "sqlite":
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+@pytest.fixture
+def fresh_db():
+    """
+    A fresh, empty database for one test.
+    """
+    async def reset():
+        await engine.dispose()
+        if os.path.exists(_db_path):
+            os.remove(_db_path)
+        await upgrade(engine)
+        await engine.dispose()
+
+    asyncio.run(reset())
+    yield engine
+    asyncio.run(engine.dispose())
@@ -0,0 +1,173 @@
+import asyncio
+from decimal import Decimal
+from typing import Optional
+
+import httpx
+import pytest
+from sqlalchemy import delete, update
+
+from app.config import settings
+from app.databaseConfigs.database import SessionLocal
+from app.databaseConfigs.models.productServiceModel.catalog_view import CatalogView
+from app.databaseConfigs.models.productServiceModel.product import Product
+from app.databaseConfigs.models.productServiceModel.product_size import ProductSize
+from app.main import app
+from app.productService.schemas.stock_reservation import ReservationItem
+from app.productService.services import stock_reservation as reservation_service
+from app.productService.services.catalog_view import (
+    CatalogViewError,
+    check_catalog_view,
+    rebuild_catalog_view,
+    refresh_catalog_view,
+)
+from app.productService.services.pricing import refresh_effective_prices
+from app.productService.services.product_cache import product_cache
+
+
+async def _catalog_product(stock: int, discount: Optional[int] = 0) -> ProductSize:
+    async with SessionLocal() as db:
+        size = ProductSize(size="M", stock=stock, additional_price=Decimal("0.00"))
+        product = Product(
+            sku=1,
+            name="Listed product",
+            thumbnail="",
+            price=Decimal("10.00"),
+            cost_price=Decimal("5.00"),
+            discount=discount,
+            max_order_count=5,
+            is_active=True,
+            sizes=[size],
+        )
+        db.add(product)
+        await db.flush()
+        if discount is None:
+            # The column default would fill in 0; imports and older rows can hold NULL
+            await db.execute(update(Product).where(Product.id == product.id).values(discount=None))
+        await refresh_effective_prices(db, [product.id])
+        await refresh_catalog_view(db, [product.id])
+        await db.commit()
+        return size
+
+
+def _client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def test_listings_leave_stock_out_and_detail_shows_current_stock(fresh_db):
+    async def scenario():
+        size = await _catalog_product(stock=10)
+        async with _client() as client:
+            listing = await client.get("/api/v1/products/")
+            assert listing.status_code == 200
+            assert listing.json()[0]["sizes"] == [{"id": size.id, "size": "M", "additional_price": 0.0}]
+
+            detail = await client.get(f"/api/v1/products/{size.product_id}")
+            assert detail.json()["sizes"][0]["stock"] == 10
+            sizes = await client.get(f"/api/v1/sizes/product/{size.product_id}")
+
+            async with SessionLocal() as db:
+                await reservation_service.reserve_stock(db, [ReservationItem(size_id=size.id, quantity=3)])
+
+            detail = await client.get(f"/api/v1/products/{size.product_id}")
+            assert detail.json()["sizes"][0]["stock"] == 7
+            # The size list shows stock, so its old tag no longer matches
+            sizes = await client.get(
+                f"/api/v1/sizes/product/{size.product_id}", headers={"If-None-Match": sizes.headers["etag"]}
+            )
+            assert sizes.status_code == 200 and sizes.json()[0]["stock"] == 7
+            # The reservation changed nothing the listing shows
+            assert (await client.get("/api/v1/products/")).content == listing.content
+
+    asyncio.run(scenario())
+
+
+def test_list_etag_is_weak_and_revalidates(fresh_db):
+    async def scenario():
+        await _catalog_product(stock=1)
+        async with _client() as client:
+            listing = await client.get("/api/v1/products/")
+            etag = listing.headers["etag"]
+            assert etag.startswith('W/"')
+
+            for sent in (etag, etag.removeprefix("W/")):
+                revalidated = await client.get("/api/v1/products/", headers={"If-None-Match": sent})
+                assert revalidated.status_code == 304
+                assert revalidated.headers["etag"] == etag
+
+    asyncio.run(scenario())
+
+
+def test_discount_sort_pages_across_products_without_a_discount(fresh_db):
+    async def scenario():
+        expected = [(await _catalog_product(stock=1, discount=discount)).product_id for discount in (30, None, 10)]
+        expected = [expected[0], expected[2], expected[1]]  # a missing discount sorts as 0
+        async with _client() as client:
+            for path in ("/api/v1/products/", "/api/v1/products/summary"):
+                seen, cursor = [], None
+                while True:
+                    params = {"sort": "discount", "limit": 1, **({"cursor": cursor} if cursor else {})}
+                    page = await client.get(path, params=params)
+                    assert page.status_code == 200, page.text
+                    seen += [item["id"] for item in page.json()]
+                    cursor = page.headers.get("x-next-cursor")
+                    if not cursor:
+                        break
+                assert seen == expected, path
+
+    asyncio.run(scenario())
+
+
+def test_startup_check_refuses_a_catalog_view_missing_products(fresh_db):
+    async def scenario():
+        await _catalog_product(stock=1)
+        async with fresh_db.connect() as conn:
+            await check_catalog_view(conn)
+            await conn.execute(delete(CatalogView))
+            with pytest.raises(CatalogViewError):
+                await check_catalog_view(conn)
+
+            await conn.commit()
+        async with SessionLocal() as db:
+            await rebuild_catalog_view(db)
+        async with fresh_db.connect() as conn:
+            await check_catalog_view(conn)
+
+    asyncio.run(scenario())
+
+
+def test_update_changes_only_the_fields_sent(fresh_db):
+    async def scenario():
+        size = await _catalog_product(stock=1)
+        product_id = size.product_id
+        async with _client() as client:
+            response = await client.put(f"/api/v1/products/{product_id}", data={"max_discount": "40"})
+            assert response.status_code == 200, response.text
+            response = await client.put(f"/api/v1/products/{product_id}", data={"name": "Renamed"})
+            assert response.status_code == 200, response.text
+            assert (response.json()["name"], response.json()["max_discount"]) == ("Renamed", 40)
+
+            # An empty value clears a nullable field
+            response = await client.put(f"/api/v1/products/{product_id}", data={"max_discount": ""})
+            assert (response.json()["name"], response.json()["max_discount"]) == ("Renamed", None)
+            assert response.json()["sizes"][0]["id"] == size.id
+
+    asyncio.run(scenario())
+
+
+def test_compressed_details_stay_out_of_the_product_cache(fresh_db, monkeypatch):
+    monkeypatch.setattr(settings, "COMPRESSION_MIN_SIZE", 0)
+
+    async def scenario():
+        product_id = (await _catalog_product(stock=1)).product_id
+        async with _client() as client:
+            for name in ("Listed product", "Renamed"):
+                if name != "Listed product":
+                    await client.put(f"/api/v1/products/{product_id}", data={"name": name})
+                detail = await client.get(f"/api/v1/products/{product_id}", headers={"Accept-Encoding": "gzip"})
+                assert detail.headers["content-encoding"] == "gzip"
+                assert detail.json()["name"] == name
+
+        # Only the body lives in the product cache, so invalidating the id drops everything
+        assert [key for key in product_cache.local._entries if product_id in key] == [f"product:{product_id}"]
+
+    asyncio.run(scenario())
@@ -0,0 +1,35 @@
+import asyncio
+
+from sqlalchemy import inspect
+
+from app.databaseConfigs.database import Base
+from app.databaseConfigs.models.authServiceModel import blacklist, user, user_otp  # noqa: F401
+from app.databaseConfigs.models.productServiceModel import (  # noqa: F401
+    catalog_version, catalog_view, category, product, product_size, stock_reservation, upload_blob,
+)
+
+
+def _migrated_schema(engine):
+    def read(sync_conn):
+        inspector = inspect(sync_conn)
+        return {
+            name: (
+                {column["name"] for column in inspector.get_columns(name)},
+                {index["name"] for index in inspector.get_indexes(name)},
+            )
+            for name in Base.metadata.tables
+        }
+
+    async def run():
+        async with engine.connect() as conn:
+            return await conn.run_sync(read)
+
+    return asyncio.run(run())
+
+
+def test_migrations_build_the_schema_the_models_declare(fresh_db):
+    schema = _migrated_schema(fresh_db)
+    for name, table in Base.metadata.tables.items():
+        columns, indexes = schema[name]
+        assert columns == {column.name for column in table.columns}, name
+        assert indexes == {index.name for index in table.indexes}, name
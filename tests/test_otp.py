@@ -0,0 +1,64 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+from sqlalchemy.future import select
+
+from app.authService.services import auth as auth_service
+from app.databaseConfigs.database import SessionLocal
+from app.databaseConfigs.models.authServiceModel.user import User
+from app.databaseConfigs.models.authServiceModel.user_otp import UserOtp
+
+
+async def _user(db, email: str, phone: str) -> User:
+    user = User(phone_number=phone, email=email, password=auth_service.DISABLED_PASSWORD, name="Buyer")
+    db.add(user)
+    await db.commit()
+    return user
+
+
+def test_otp_verifies_once(fresh_db):
+    async def scenario():
+        async with SessionLocal() as db:
+            user = await _user(db, "one@example.com", "+911000000001")
+            otp = await auth_service.set_otp_for_user(user, db)
+
+            assert await auth_service.verify_otp(user, "000000", db) is False  # never issued
+            assert await auth_service.verify_otp(user, otp, db) is True
+            assert await auth_service.verify_otp(user, otp, db) is False
+
+    asyncio.run(scenario())
+
+
+def test_expired_otp_does_not_verify(fresh_db):
+    async def scenario():
+        async with SessionLocal() as db:
+            user = await _user(db, "late@example.com", "+911000000002")
+            otp = await auth_service.set_otp_for_user(user, db)
+            await db.execute(update(UserOtp).values(expires_at=datetime.utcnow() - timedelta(seconds=1)))
+            await db.commit()
+            assert await auth_service.verify_otp(user, otp, db) is False
+
+    asyncio.run(scenario())
+
+
+def test_otp_digest_is_bound_to_its_user(fresh_db):
+    async def scenario():
+        async with SessionLocal() as db:
+            alice = await _user(db, "alice@example.com", "+911000000003")
+            mallory = await _user(db, "mallory@example.com", "+911000000004")
+            otp = await auth_service.set_otp_for_user(alice, db)
+            await auth_service.set_otp_for_user(mallory, db)
+
+            # Alice's digest copied onto Mallory's row is no good with Alice's code
+            digest = (await db.execute(select(UserOtp.digest).where(UserOtp.user_id == alice.userid))).scalar()
+            await db.execute(update(UserOtp).where(UserOtp.user_id == mallory.userid).values(digest=digest))
+            await db.commit()
+            assert await auth_service.verify_otp(mallory, otp, db) is False
+            assert await auth_service.verify_otp(alice, otp, db) is True
+
+    asyncio.run(scenario())
+
+
+def test_disabled_password_never_verifies():
+    assert asyncio.run(auth_service.verify_password("!", auth_service.DISABLED_PASSWORD)) is False
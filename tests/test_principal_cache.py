@@ -0,0 +1,47 @@
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import update
+
+from app.adminService.admin import UserAdmin
+from app.authService.auth import jwt as jwt_utils
+from app.authService.auth.dependencies import get_current_user
+from app.databaseConfigs.database import SessionLocal
+from app.databaseConfigs.models.authServiceModel.user import User
+
+
+async def _current_user(token: str) -> User:
+    async with SessionLocal() as db:
+        return await get_current_user(token, db, db)
+
+
+def test_principal_is_cached_without_the_password_and_dropped_on_admin_role_change(fresh_db):
+    async def scenario():
+        async with SessionLocal() as db:
+            user = User(phone_number="+911000000010", email="staff@example.com", password="!", name="Staff", role="user")
+            db.add(user)
+            await db.commit()
+        token = jwt_utils.create_access_token({"sub": "staff@example.com"}, timedelta(minutes=5))
+
+        principal = await _current_user(token)
+        assert (principal.userid, principal.role, principal.password) == (user.userid, "user", None)
+
+        # A change that skips the invalidation hooks is not seen until the TTL runs out
+        async with SessionLocal() as db:
+            await db.execute(update(User).where(User.userid == user.userid).values(name="Renamed"))
+            await db.commit()
+        assert (await _current_user(token)).name == "Staff"
+
+        # The admin view's hooks drop the cached principal once the edit is committed
+        admin, request = UserAdmin(), SimpleNamespace(state=SimpleNamespace())
+        async with SessionLocal() as db:
+            model = await db.get(User, user.userid)
+            await admin.on_model_change({}, model, False, request)
+            model.role = "admin"
+            await db.commit()
+            await admin.after_model_change({}, model, False, request)
+        principal = await _current_user(token)
+        assert (principal.role, principal.name) == ("admin", "Renamed")
+
+    asyncio.run(scenario())
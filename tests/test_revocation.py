@@ -0,0 +1,74 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app.authService.auth import jwt as jwt_utils
+from app.authService.auth.revocation import BloomFilter, RevocationFilter
+from app.databaseConfigs.database import SessionLocal
+from app.databaseConfigs.models.authServiceModel.blacklist import BlacklistedToken
+
+
+class _NoQueries:
+    async def execute(self, *args, **kwargs):
+        raise AssertionError("the revocation filter should have answered")
+
+
+async def _blacklist(jti: str, expires_in: timedelta = timedelta(hours=1)) -> None:
+    # As another worker would: straight to the table, bypassing this worker's filter
+    async with SessionLocal() as db:
+        db.add(BlacklistedToken(jti=jti, expires_at=datetime.utcnow() + expires_in))
+        await db.commit()
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    keys = [f"jti-{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_miss_is_answered_without_a_query_and_hit_asks_the_database(fresh_db, monkeypatch):
+    async def scenario():
+        await _blacklist("revoked")
+        await _blacklist("expired", expires_in=timedelta(hours=-1))
+        revocations = RevocationFilter(error_rate=0.01, exact_max=100)
+        assert revocations.check("anything") is None  # not loaded yet: ask the database
+        await revocations.load()
+        monkeypatch.setattr(jwt_utils, "revocation_filter", revocations)
+
+        assert revocations.check("never-revoked") is False
+        assert await jwt_utils.is_token_blacklisted("never-revoked", _NoQueries()) is False
+        assert revocations.check("revoked") is None
+        async with SessionLocal() as db:
+            assert await jwt_utils.is_token_blacklisted("revoked", db) is True
+
+        revocations.add("local", datetime.utcnow() + timedelta(hours=1))
+        revocations.add("local-expired", datetime.utcnow() - timedelta(seconds=1))
+        assert await jwt_utils.is_token_blacklisted("local", _NoQueries()) is True
+        assert await jwt_utils.is_token_blacklisted("local-expired", _NoQueries()) is False
+
+    asyncio.run(scenario())
+
+
+def test_sync_picks_up_other_workers_and_load_folds_them_in(fresh_db):
+    async def scenario():
+        revocations = RevocationFilter(error_rate=0.01, exact_max=100)
+        await revocations.load()
+        await _blacklist("elsewhere")
+        assert revocations.check("elsewhere") is False  # not seen until the next sync
+        await revocations.sync()
+        assert revocations.check("elsewhere") is True
+
+        revocations.add("expires-soon", datetime.utcnow() - timedelta(seconds=1))
+        await revocations.sync()
+        assert revocations.stats()["exact_entries"] == 1  # the expired entry was pruned
+
+        # A reload folds synced entries into the Bloom filter (so they need the database)
+        # and drops the exact map
+        await revocations.load()
+        assert revocations.check("elsewhere") is None
+        assert revocations.stats()["exact_entries"] == 0
+
+    asyncio.run(scenario())
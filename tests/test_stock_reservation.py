@@ -0,0 +1,122 @@
+import asyncio
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, func, update
+from sqlalchemy.future import select
+
+from app.databaseConfigs.database import SessionLocal
+from app.databaseConfigs.models.authServiceModel.user import User
+from app.databaseConfigs.models.productServiceModel.catalog_version import CatalogVersion
+from app.databaseConfigs.models.productServiceModel.product import Product
+from app.databaseConfigs.models.productServiceModel.product_size import ProductSize
+from app.databaseConfigs.models.productServiceModel.stock_reservation import StockReservation
+from app.productService.schemas.stock_reservation import ReservationItem
+from app.productService.services import stock_reservation as reservation_service
+
+
+async def _product_with_size(stock: int = 10) -> ProductSize:
+    async with SessionLocal() as db:
+        size = ProductSize(size="M", stock=stock, additional_price=Decimal("0.00"))
+        db.add(Product(
+            sku=1,
+            name="Test product",
+            thumbnail="",
+            price=Decimal("10.00"),
+            cost_price=Decimal("5.00"),
+            max_order_count=5,
+            is_active=True,
+            sizes=[size],
+        ))
+        await db.commit()
+        return size
+
+
+async def _catalog_version() -> int:
+    async with SessionLocal() as db:
+        return (await db.execute(select(CatalogVersion.version))).scalar_one()
+
+
+async def _count_reservations() -> int:
+    async with SessionLocal() as db:
+        return (await db.execute(select(func.count()).select_from(StockReservation))).scalar()
+
+
+def test_sweeper_removes_reservation_whose_size_was_deleted(fresh_db):
+    async def scenario():
+        size = await _product_with_size()
+        async with SessionLocal() as db:
+            await reservation_service.reserve_stock(db, [ReservationItem(size_id=size.id, quantity=1)])
+        async with SessionLocal() as db:
+            # Cascades to the reservation's only item
+            await db.execute(delete(ProductSize).where(ProductSize.id == size.id))
+            await db.execute(update(StockReservation).values(expires_at=datetime.utcnow() - timedelta(minutes=1)))
+            await db.commit()
+
+        expired = await asyncio.wait_for(reservation_service.expire_reservations(batch_size=1), timeout=5)
+        assert expired == 1
+        assert await _count_reservations() == 0
+
+    asyncio.run(scenario())
+
+
+def test_sweeper_returns_stock_of_expired_reservations(fresh_db):
+    async def scenario():
+        size = await _product_with_size(stock=10)
+        async with SessionLocal() as db:
+            for _ in range(3):
+                await reservation_service.reserve_stock(db, [ReservationItem(size_id=size.id, quantity=2)])
+        async with SessionLocal() as db:
+            await db.execute(update(StockReservation).values(expires_at=datetime.utcnow() - timedelta(minutes=1)))
+            await db.commit()
+
+        assert await reservation_service.expire_reservations(batch_size=2) == 3
+        assert await _count_reservations() == 0
+        async with SessionLocal() as db:
+            assert (await db.get(ProductSize, size.id)).stock == 10
+
+    asyncio.run(scenario())
+
+
+def test_order_limit_counts_the_users_other_reservations(fresh_db):
+    async def scenario():
+        size = await _product_with_size(stock=20)  # max_order_count=5
+        async with SessionLocal() as db:
+            user = User(phone_number="+911234567890", email="buyer@example.com", password="!", name="Buyer")
+            db.add(user)
+            await db.commit()
+
+        async with SessionLocal() as db:
+            await reservation_service.reserve_stock(db, [ReservationItem(size_id=size.id, quantity=3)], user.userid)
+        async with SessionLocal() as db:
+            with pytest.raises(HTTPException) as excinfo:
+                await reservation_service.reserve_stock(db, [ReservationItem(size_id=size.id, quantity=3)], user.userid)
+        assert excinfo.value.status_code == 400
+
+        async with SessionLocal() as db:
+            await reservation_service.reserve_stock(db, [ReservationItem(size_id=size.id, quantity=2)], user.userid)
+            # Other buyers have their own allowance
+            await reservation_service.reserve_stock(db, [ReservationItem(size_id=size.id, quantity=5)])
+
+    asyncio.run(scenario())
+
+
+def test_catalog_version_bumps_only_when_a_size_sells_out_or_returns(fresh_db):
+    async def scenario():
+        size = await _product_with_size(stock=4)
+        start = await _catalog_version()
+        async with SessionLocal() as db:
+            await reservation_service.reserve_stock(db, [ReservationItem(size_id=size.id, quantity=2)])
+        assert await _catalog_version() == start
+
+        async with SessionLocal() as db:
+            last = await reservation_service.reserve_stock(db, [ReservationItem(size_id=size.id, quantity=2)])
+        assert await _catalog_version() == start + 1
+
+        async with SessionLocal() as db:
+            assert await reservation_service.release_reservations(db, [last.id]) == 1
+        assert await _catalog_version() == start + 2
+
+    asyncio.run(scenario())
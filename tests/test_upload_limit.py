@@ -0,0 +1,58 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI, File, UploadFile
+
+from app.utils.upload_limit import UploadLimitMiddleware
+
+LIMIT = 64 * 1024
+BOUNDARY = "limit-test"
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(UploadLimitMiddleware, max_bytes=LIMIT, exempt_paths={"/import"})
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    @app.post("/import")
+    async def bulk_import(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    return app
+
+
+def _multipart(size: int) -> bytes:
+    return (
+        f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="file"; filename="a.bin"\r\n'
+        "Content-Type: application/octet-stream\r\n\r\n"
+    ).encode() + b"x" * size + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+async def _post(path: str, body, **headers) -> httpx.Response:
+    headers["Content-Type"] = f"multipart/form-data; boundary={BOUNDARY}"
+    transport = httpx.ASGITransport(app=_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.post(path, content=body, headers=headers)
+
+
+async def _chunks(body: bytes):
+    for start in range(0, len(body), 8192):
+        yield body[start:start + 8192]
+
+
+def test_declared_length_over_the_limit_is_rejected_up_front():
+    response = asyncio.run(_post("/upload", _multipart(LIMIT * 2)))
+    assert response.status_code == 413
+
+
+def test_streamed_body_is_cut_off_once_it_passes_the_limit():
+    response = asyncio.run(_post("/upload", _chunks(_multipart(LIMIT * 2))))
+    assert response.status_code == 413
+
+
+def test_bodies_within_the_limit_and_exempt_paths_pass():
+    assert asyncio.run(_post("/upload", _multipart(1024))).json() == {"size": 1024}
+    assert asyncio.run(_post("/import", _multipart(LIMIT * 2))).json() == {"size": LIMIT * 2}